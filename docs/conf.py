@@ -1,54 +1,73 @@
 # Configuration file for the Sphinx documentation builder.
 
-import sys
+import importlib.metadata
+import os
+import re
+import tomllib
 from pathlib import Path
 
-# Add the project root to the Python path
-project_root = Path(__file__).parent.parent / "src"
-sys.path.insert(0, str(project_root))
+# Source tree of the package. AutoAPI parses it statically, so the package is
+# never imported and sys.path is left untouched.
+project_root = Path(__file__).resolve().parent.parent / "src"
+
+# Release builds set DOCS_FULL=1 to enable the slower, optional extensions.
+# Local and CI preview builds leave it unset.
+docs_full = bool(os.environ.get("DOCS_FULL"))
 
 # -- Project information -----------------------------------------------------
 project = "PalletDataGenerator"
 copyright = "2025, Ibrahim Boubakri"
 author = "Ibrahim Boubakri"
 
-# The full version, including alpha/beta/rc tags
-try:
-    from palletdatagenerator import __version__
 
-    release = __version__
-    version = __version__
-except ImportError:
-    # Fallback if package is not installed
-    release = "0.1.3"
-    version = "0.1.3"
+def _read_version():
+    """Read the package version without importing the package."""
+    pyproject = Path(__file__).parent.parent / "pyproject.toml"
+    try:
+        with pyproject.open("rb") as f:
+            return tomllib.load(f)["project"]["version"]
+    except FileNotFoundError:
+        # Docs copied out of a checkout: use the installed distribution metadata
+        return importlib.metadata.version("palletdatagenerator")
+
+
+# Keep these deterministic (no git/dev suffixes) so that commits which do not
+# bump the version leave Sphinx's cached environment valid.
+# The full version, including alpha/beta/rc tags
+release = re.match(r"(\d+\.\d+\.\d+)", _read_version()).group(1)
+# The short X.Y version
+version = ".".join(release.split(".")[:2])
 
 # -- General configuration ---------------------------------------------------
 
 # Add any Sphinx extension module names here, as strings.
-extensions = [
-    "sphinx.ext.autodoc",
-    "sphinx.ext.autosummary",
+extensions = (
+    "autoapi.extension",  # Static API docs, no Blender imports needed
     "sphinx.ext.doctest",
     "sphinx.ext.intersphinx",
-    "sphinx.ext.todo",
     "sphinx.ext.coverage",
-    "sphinx.ext.mathjax",
     "sphinx.ext.ifconfig",
-    "sphinx.ext.viewcode",
     "sphinx.ext.napoleon",
     "sphinx.ext.githubpages",
     "myst_parser",  # For Markdown support
     "sphinx_rtd_theme",
-    "sphinx_copybutton",
-    "sphinxext.opengraph",
-]
+)
+if docs_full:
+    # Highlighted source pages and todo lists need extra passes over the package;
+    # OpenGraph tags and copy buttons add per-page work only the site needs.
+    extensions += (
+        "sphinx.ext.viewcode",
+        "sphinx.ext.todo",
+        "sphinx_copybutton",
+        "sphinxext.opengraph",
+    )
+    # Todo extension settings
+    todo_include_todos = True
 
 # MyST parser configuration for Markdown support
-myst_enable_extensions = [
+myst_enable_extensions = (
     "colon_fence",
     "deflist",
-    "dollarmath",
     "fieldlist",
     "html_admonition",
     "html_image",
@@ -58,7 +77,7 @@ myst_enable_extensions = [
     "strikethrough",
     "substitution",
     "tasklist",
-]
+)
 
 # Source file suffixes: map to parser names to avoid "None is not a valid filetype" warnings
 source_suffix = {
@@ -66,35 +85,15 @@ source_suffix = {
     ".md": "markdown",
 }
 
-# Mock imports for modules that aren't available in CI (Blender/Python API)
-autodoc_mock_imports = [
-    "bpy",
-    "bpy_extras",
-    "bmesh",
-    "mathutils",
-    "addon_utils",
-    "palletdatagenerator.core",
-    "palletdatagenerator.core.renderer",
-    "palletdatagenerator.core.generator",
-    "palletdatagenerator.core.config_loader",
-    "palletdatagenerator.exporters",
-    "palletdatagenerator.exporters.coco",
-    "palletdatagenerator.exporters.voc",
-    "palletdatagenerator.exporters.yolo",
-]
-
-# Suppress autodoc import warnings so docs can be built without Blender installed
-# Suppress autodoc import warnings so docs can be built without Blender installed
-# Also suppress autosummary and nitpicky reference warnings which CI treats as errors
-suppress_warnings = [
-    "autodoc.import_object",
-    "autodoc.failed-import",
-    "autosummary",  # suppress autosummary generation import warnings
+# Don't warn about every unresolvable reference; suppress the remaining
+# reference warnings, which CI treats as errors
+nitpicky = False
+suppress_warnings = (
     "myst.xref_missing",
-]
-
-# Add any paths that contain templates here, relative to this directory.
-templates_path = ["_templates"]
+    "ref.python",
+    "ref.any",
+    "toc.not_readable",
+)
 
 # List of patterns, relative to source directory, that match files and
 # directories to ignore when looking for source files.
@@ -128,16 +127,17 @@ html_theme_options = {
 # Add any paths that contain custom static files (such as style sheets) here,
 # relative to this directory. They are copied after the builtin static files,
 # so a file named "default.css" will overwrite the builtin "default.css".
-html_static_path = ["_static"]
+# Listing the files themselves keeps Sphinx from walking the whole directory.
+html_static_path = ["_static/custom.css"]
 
-# Custom CSS
+# Custom CSS. Given in the (filename, attributes) form Sphinx normalises it to
+# at startup, including the default priority it fills in. A plain string would
+# compare unequal to the pickled value and force every page to be rewritten on
+# each incremental build.
 html_css_files = [
-    "custom.css",
+    ("custom.css", {"priority": 800}),
 ]
 
-# Custom JavaScript
-html_js_files = []
-
 # HTML context for templating
 html_context = {
     "display_github": True,
@@ -148,57 +148,71 @@ html_context = {
     "source_suffix": source_suffix,
 }
 
+# Language of the search index. The English stemmer comes from snowballstemmer,
+# which transparently uses the C-backed PyStemmer when it is installed; both
+# implement the same Snowball algorithm as the JavaScript side of the search.
+html_search_language = "en"
+
 # The name of the Pygments (syntax highlighting) style to use.
 pygments_style = "sphinx"
 
-# -- Options for LaTeX output ------------------------------------------------
+# LaTeX, man page and Texinfo settings are only used by those builders. The
+# Makefile passes "-t offline" to every non-HTML target (and release builds set
+# DOCS_FULL), so plain HTML builds skip these blocks. Sphinx falls back to
+# defaults derived from project/author if a builder runs without the tag.
+offline_formats = docs_full or tags.has("offline")  # noqa: F821 (set by Sphinx)
 
-latex_elements = {
-    "papersize": "letterpaper",
-    "pointsize": "10pt",
-    "preamble": "",
-    "fncychap": "",
-    "fontpkg": "",
-}
+# -- Options for LaTeX output ------------------------------------------------
 
-# Grouping the document tree into LaTeX files.
-latex_documents = [
-    (
-        master_doc,
-        "PalletDataGenerator.tex",
-        "PalletDataGenerator Documentation",
-        "PalletDataGenerator Contributors",
-        "manual",
-    ),
-]
+if offline_formats:
+    latex_elements = {
+        "papersize": "letterpaper",
+        "pointsize": "10pt",
+        "preamble": "",
+        "fncychap": "",
+        "fontpkg": "",
+    }
+
+    # Grouping the document tree into LaTeX files.
+    latex_documents = [
+        (
+            master_doc,
+            "PalletDataGenerator.tex",
+            "PalletDataGenerator Documentation",
+            "PalletDataGenerator Contributors",
+            "manual",
+        ),
+    ]
 
 # -- Options for manual page output ------------------------------------------
 
-# One entry per manual page.
-man_pages = [
-    (
-        master_doc,
-        "palletdatagenerator",
-        "Pallet Data Generator Documentation",
-        [author],
-        1,
-    )
-]
+if offline_formats:
+    # One entry per manual page.
+    man_pages = [
+        (
+            master_doc,
+            "palletdatagenerator",
+            "Pallet Data Generator Documentation",
+            [author],
+            1,
+        )
+    ]
 
 # -- Options for Texinfo output ----------------------------------------------
 
-# Grouping the document tree into Texinfo files.
-texinfo_documents = [
-    (
-        master_doc,
-        "PalletDataGenerator",
-        "Pallet Data Generator Documentation",
-        author,
-        "PalletDataGenerator",
-        "Generate synthetic pallet datasets using Blender.",
-        "Miscellaneous",
-    ),
-]
+if offline_formats:
+    # Grouping the document tree into Texinfo files.
+    texinfo_documents = [
+        (
+            master_doc,
+            "PalletDataGenerator",
+            "Pallet Data Generator Documentation",
+            author,
+            "PalletDataGenerator",
+            "Generate synthetic pallet datasets using Blender.",
+            "Miscellaneous",
+        ),
+    ]
 
 # -- Extension configuration -------------------------------------------------
 
@@ -218,18 +232,18 @@ napoleon_preprocess_types = False
 napoleon_type_aliases = None
 napoleon_attr_annotations = True
 
-# Autodoc settings
-autodoc_default_options = {
-    "members": True,
-    "member-order": "bysource",
-    "special-members": "__init__",
-    "undoc-members": True,
-    "exclude-members": "__weakref__",
-}
-
-# Autosummary settings
-autosummary_generate = True
-autosummary_generate_overwrite = False
+# AutoAPI settings (parses the sources statically instead of importing them)
+autoapi_type = "python"
+autoapi_dirs = [str(project_root / "palletdatagenerator")]
+autoapi_keep_files = True
+autoapi_add_toctree_entry = True
+# Only documented public members; skips undocumented attributes and dunders
+autoapi_options = [
+    "members",
+    "show-inheritance",
+    "show-module-summary",
+    "imported-members",
+]
 
 # Intersphinx mapping
 intersphinx_mapping = {
@@ -237,13 +251,57 @@ intersphinx_mapping = {
     "numpy": ("https://numpy.org/doc/stable/", None),
     "matplotlib": ("https://matplotlib.org/stable/", None),
 }
-
-# Todo extension settings
-todo_include_todos = True
-
-# Copy button configuration
-copybutton_prompt_text = r">>> |\.\.\. |\$ |In \[\d*\]: | {2,5}\.\.\.: | {5,8}: "
+# Inventories are cached in the pickled environment; with the doctrees kept
+# outside _build (see Makefile) they are only re-downloaded every 90 days.
+intersphinx_cache_limit = 90
+
+# Copy button configuration. The pattern is compiled once here so a typo fails
+# the build immediately; the extension hands the source string to its JS.
+_COPY_PROMPT_RE = re.compile(r">>> |\.\.\. |\$ |In \[\d*\]: | {2,5}\.\.\.: | {5,8}: ")
+copybutton_prompt_text = _COPY_PROMPT_RE.pattern
 copybutton_prompt_is_regexp = True
 
 # GitHub Pages configuration
 html_baseurl = "https://boubakriibrahim.github.io/PalletDataGenerator/"
+
+# -- Build hooks ---------------------------------------------------------------
+
+# AutoAPI rewrites every stub whenever any source file changed, which bumps
+# their mtimes and makes Sphinx re-read all API pages. Remember the stubs as
+# they were before AutoAPI runs and put back the old mtime on the ones whose
+# content came out identical, so only the affected pages are rebuilt.
+_api_stubs = {}
+
+
+def _snapshot_api_stubs(app):
+    """Record content and mtime of the kept AutoAPI stubs."""
+    _api_stubs.clear()
+    for path in (Path(app.srcdir) / app.config.autoapi_root).rglob("*.rst"):
+        _api_stubs[path] = (path.read_bytes(), path.stat().st_mtime_ns)
+
+
+def _check_api_stamp(app):
+    """Force AutoAPI to regenerate when its kept stubs are missing.
+
+    AutoAPI stamps the newest source mtime into the environment and skips
+    parsing and rendering while no source file is newer. The stamp survives
+    ``make clean`` (doctrees are kept outside _build) but the stubs do not, so
+    drop the stamp whenever the generated index is gone.
+    """
+    index = Path(app.srcdir) / app.config.autoapi_root / "index.rst"
+    if not index.exists():
+        app.env.autoapi_max_mtime = 0
+
+
+def _restore_unchanged_api_stubs(_app):
+    """Undo the mtime bump on stubs that AutoAPI rewrote with the same content."""
+    for path, (content, mtime_ns) in _api_stubs.items():
+        if path.exists() and path.read_bytes() == content:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def setup(app):
+    # AutoAPI generates the stubs in a default-priority (500) builder-inited hook
+    app.connect("builder-inited", _check_api_stamp, priority=400)
+    app.connect("builder-inited", _snapshot_api_stubs, priority=400)
+    app.connect("builder-inited", _restore_unchanged_api_stubs, priority=600)
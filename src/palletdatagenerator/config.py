@@ -164,6 +164,8 @@ SINGLE_PALLET_CONFIG = {
     "analysis_show_keypoints": True,  # Show keypoints in analysis images
     "analysis_show_2d_boxes": True,  # Show 2D bounding boxes of selected faces in analysis images
     "analysis_show_3d_coordinates": True,  # Show 3D coordinates of selected faces in analysis images
+    "enable_3d_debug_visualization": True,  # Save matplotlib 3D debug views per frame
+    "debug_3d_dpi": 100,  # Resolution of the saved 3D debug views
 }
 
 
@@ -174,6 +176,7 @@ WAREHOUSE_CONFIG = {
     "num_scenes": 3,
     "max_images_per_scene": 15,
     "max_total_images": 50,
+    # "seed": 42,  # Uncomment for repeatable scenes/camera paths; unset = fresh each run
     # Render quality
     "resolution_x": 1280,
     "resolution_y": 720,
@@ -199,6 +202,8 @@ WAREHOUSE_CONFIG = {
     "generate_analysis": True,
     "generate_segmentation": True,
     "save_scene_before_render": False,
+    "verbose_placement": False,  # Print per-box placement traces
+    "unique_mesh_per_box": False,  # Give each placed box its own mesh copy
     # Detection
     "max_faces_per_pallet": 2,
     "min_pallet_area": 100,
@@ -232,6 +237,8 @@ WAREHOUSE_CONFIG = {
     "analysis_show_keypoints": True,  # Show keypoints in analysis images
     "analysis_show_2d_boxes": True,  # Show 2D bounding boxes of selected faces in analysis images
     "analysis_show_3d_coordinates": True,  # Show 3D coordinates of selected faces in analysis images
+    "enable_3d_debug_visualization": True,  # Save matplotlib 3D debug views per frame
+    "debug_3d_dpi": 100,  # Resolution of the saved 3D debug views
 }
 
 
@@ -9,14 +9,17 @@ import contextlib
 import ensurepip
 import glob
 import importlib
+import json
 import math
 import os
 import random
+import re
 import site
 import subprocess
 import sys
 
 import bpy
+import numpy as np
 from bpy_extras.object_utils import world_to_camera_view as w2cv
 from mathutils import Vector
 
@@ -65,9 +68,44 @@ except ImportError:
     except Exception:
         VocWriter = None
 
+# ------------------------ 3) orjson (optional) ----------------------
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger.info(f"Pillow available: {PIL_AVAILABLE}")
 
 
+def _json_default(obj):
+    """Serialize NumPy values for the stdlib json fallback, like orjson does."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_agg_backend_selected = False
+
+
+def _pyplot():
+    """Import pyplot, selecting the headless Agg backend on first use only."""
+    global _agg_backend_selected
+    if not _agg_backend_selected:
+        import matplotlib as mpl
+
+        mpl.use("Agg")  # headless: no interactive backend needed
+        _agg_backend_selected = True
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+# Name fragments of face/helper meshes that are not pallets themselves
+_NON_PALLET_NAME_RE = re.compile("down|bottom|top|up|face")
+
+
 class BaseGenerator:
     """
     Base class for all generation modes with shared functionality.
@@ -76,6 +114,9 @@ class BaseGenerator:
     def __init__(self, config):
         self.config = config
         self.paths = {}
+        # 3D debug figure, created once and cleared between frames
+        self._debug_fig = None
+        self._debug_ax = None
 
     def setup_folders(self):
         """Create the output folder structure."""
@@ -113,6 +154,35 @@ class BaseGenerator:
         os.makedirs(path, exist_ok=True)
         return path
 
+    def _write_json(self, path, data):
+        """Write indented JSON, using orjson when it is installed.
+
+        Both paths accept NumPy values and non-str (e.g. int) keys.
+        """
+        if orjson is not None:
+            option = (
+                orjson.OPT_INDENT_2
+                | orjson.OPT_SERIALIZE_NUMPY
+                | orjson.OPT_NON_STR_KEYS
+            )
+            with open(path, "wb") as f:
+                f.write(orjson.dumps(data, option=option))
+        else:
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2, default=_json_default)
+
+    def save_final_outputs(self, coco, meta):
+        """Save final COCO and metadata files."""
+        root = self.config["output_dir"]
+
+        self._write_json(os.path.join(root, "annotations_coco.json"), coco)
+        self._write_json(
+            os.path.join(root, "dataset_manifest.json"),
+            {"config": self.config, "frames": meta},
+        )
+
+        print("✅ COCO / YOLO / VOC annotations written.")
+
     def configure_render(self):
         """Configure Blender render settings."""
         cfg = self.config
@@ -1033,15 +1103,23 @@ class BaseGenerator:
             "is_cropped": crop_ratio > 0.01,
         }
 
+    def _local_to_world(self, obj, points):
+        """Transform an (N, 3) array of local points by obj.matrix_world in one matmul."""
+        m = np.asarray(obj.matrix_world, dtype=np.float64)
+        return np.asarray(points, dtype=np.float64) @ m[:3, :3].T + m[:3, 3]
+
+    def _world_corners(self, obj):
+        """Return the 8 ``bound_box`` corners of obj in world space as an (8, 3) array."""
+        return self._local_to_world(obj, obj.bound_box)
+
     def bbox_3d_oriented(self, obj):
         """Get 3D oriented bounding box - EXACT from original."""
         bpy.context.view_layer.update()
-        world = [obj.matrix_world @ Vector(c) for c in obj.bound_box]
-        cen = sum(world, Vector()) / 8
+        world = self._local_to_world(obj, obj.bound_box)
         size = list(obj.dimensions)
         return {
-            "corners": [[v.x, v.y, v.z] for v in world],
-            "center": [cen.x, cen.y, cen.z],
+            "corners": world.tolist(),
+            "center": world.mean(axis=0).tolist(),
             "size": size,
         }
 
@@ -1133,8 +1211,7 @@ class BaseGenerator:
                 [xmax, y_end, z1],
             ],
         ]
-        wm = obj.matrix_world
-        return [[list(wm @ Vector(p)) for p in pocket] for pocket in pockets]
+        return self._local_to_world(obj, pockets).tolist()
 
     def auto_expose_frame(self, sc, _cam_obj):
         """Enhanced auto-exposure with minimum brightness guarantee."""
@@ -1187,10 +1264,7 @@ class BaseGenerator:
             ):
                 # Skip objects that might be bottom/top faces or other non-pallet objects
                 obj_name_lower = obj.name.lower()
-                if any(
-                    skip_word in obj_name_lower
-                    for skip_word in ["down", "bottom", "top", "up", "face"]
-                ):
+                if _NON_PALLET_NAME_RE.search(obj_name_lower):
                     logger.debug(f"Skipping non-pallet object: {obj.name}")
                     continue
 
@@ -1325,14 +1399,37 @@ class BaseGenerator:
 
         return side_faces
 
+    def _debug_3d_axes(self, plt):
+        """Return the 3D debug figure and axes, cleared for a new plot."""
+        if self._debug_fig is None:
+            self._debug_fig = plt.figure(figsize=(15, 10))
+            # Fixed margins instead of a tight bbox pass on every save
+            self._debug_fig.subplots_adjust(
+                left=0.02, right=0.98, bottom=0.02, top=0.95
+            )
+            self._debug_ax = self._debug_fig.add_subplot(111, projection="3d")
+        else:
+            self._debug_ax.clear()
+        return self._debug_fig, self._debug_ax
+
+    def _close_debug_figure(self):
+        """Release the cached 3D debug figure once generation is done."""
+        if self._debug_fig is None:
+            return
+        import matplotlib.pyplot as plt
+
+        plt.close(self._debug_fig)
+        self._debug_fig = None
+        self._debug_ax = None
+
     def create_3d_debug_visualization(self, obj, cam_obj, frame_id):
         """
         Create a 3D visualization showing camera position, pallet corners, and face names.
         Saves the visualization to a new debug folder.
         """
         try:
-            import matplotlib.pyplot as plt
-            import numpy as np
+            plt = _pyplot()
+            from mpl_toolkits.mplot3d.art3d import Line3DCollection
         except ImportError:
             logger.error("Matplotlib not available for 3D visualization")
             return
@@ -1347,9 +1444,8 @@ class BaseGenerator:
         # Get camera position
         camera_pos = cam_obj.location
 
-        # Create figure
-        fig = plt.figure(figsize=(15, 10))
-        ax = fig.add_subplot(111, projection="3d")
+        # Create (or reuse) figure
+        fig, ax = self._debug_3d_axes(plt)
 
         # Plot pallet corners
         corner_x = [corner.x for corner in corners_3d]
@@ -1399,12 +1495,11 @@ class BaseGenerator:
             [3, 7],  # Vertical edges
         ]
 
-        for edge in edges:
-            start = corners_3d[edge[0]]
-            end = corners_3d[edge[1]]
-            ax.plot(
-                [start.x, end.x], [start.y, end.y], [start.z, end.z], "k-", alpha=0.3
-            )
+        # All 12 edges as one collection instead of one Line3D artist each
+        corners_arr = np.array([[c.x, c.y, c.z] for c in corners_3d])
+        ax.add_collection3d(
+            Line3DCollection(corners_arr[np.array(edges)], colors="k", alpha=0.3)
+        )
 
         # Get all faces and their centers
         all_faces = self.get_all_faces_from_bbox()
@@ -1442,16 +1537,15 @@ class BaseGenerator:
             )
 
         # Draw lines from camera to each corner for distance visualization
+        cam_arr = np.array([camera_pos.x, camera_pos.y, camera_pos.z])
+        rays = np.stack((np.broadcast_to(cam_arr, corners_arr.shape), corners_arr), 1)
+        ax.add_collection3d(
+            Line3DCollection(
+                rays, colors="r", linestyles="--", alpha=0.3, linewidths=0.5
+            )
+        )
         for _i, corner in enumerate(corners_3d):
             distance = (camera_pos - corner).length
-            ax.plot(
-                [camera_pos.x, corner.x],
-                [camera_pos.y, corner.y],
-                [camera_pos.z, corner.z],
-                "r--",
-                alpha=0.3,
-                linewidth=0.5,
-            )
             # Add distance labels
             mid_x = (camera_pos.x + corner.x) / 2
             mid_y = (camera_pos.y + corner.y) / 2
@@ -1468,17 +1562,10 @@ class BaseGenerator:
         ax.legend()
 
         # Set equal aspect ratio
-        max_range = np.array(
-            [
-                corner_x + [camera_pos.x],
-                corner_y + [camera_pos.y],
-                corner_z + [camera_pos.z],
-            ]
-        ).flatten()
-        max_range = max(max_range) - min(max_range)
-        mid_x = (max(corner_x + [camera_pos.x]) + min(corner_x + [camera_pos.x])) * 0.5
-        mid_y = (max(corner_y + [camera_pos.y]) + min(corner_y + [camera_pos.y])) * 0.5
-        mid_z = (max(corner_z + [camera_pos.z]) + min(corner_z + [camera_pos.z])) * 0.5
+        pts = np.vstack((corners_arr, cam_arr))
+        lo, hi = pts.min(axis=0), pts.max(axis=0)
+        max_range = hi.max() - lo.min()
+        mid_x, mid_y, mid_z = (hi + lo) * 0.5
 
         ax.set_xlim(mid_x - max_range / 2, mid_x + max_range / 2)
         ax.set_ylim(mid_y - max_range / 2, mid_y + max_range / 2)
@@ -1486,8 +1573,7 @@ class BaseGenerator:
 
         # Save the plot
         output_path = os.path.join(debug_folder, f"frame_{frame_id:06d}_3d_debug.png")
-        plt.savefig(output_path, dpi=150, bbox_inches="tight")
-        plt.close()
+        fig.savefig(output_path, dpi=self.config.get("debug_3d_dpi", 100))
 
         logger.info(f"3D debug visualization saved to: {output_path}")
 
@@ -1528,8 +1614,8 @@ class BaseGenerator:
         logger.debug(f"Starting 3D visualization for {obj.name} (frame {frame_id})")
 
         try:
-            import matplotlib.pyplot as plt
-            import numpy as np
+            plt = _pyplot()
+            from mpl_toolkits.mplot3d.art3d import Line3DCollection
 
             logger.debug("Matplotlib imports successful")
         except ImportError as e:
@@ -1551,9 +1637,8 @@ class BaseGenerator:
             f"Camera position: ({camera_pos.x:.2f}, {camera_pos.y:.2f}, {camera_pos.z:.2f})"
         )
 
-        # Create figure
-        fig = plt.figure(figsize=(15, 10))
-        ax = fig.add_subplot(111, projection="3d")
+        # Create (or reuse) figure
+        fig, ax = self._debug_3d_axes(plt)
 
         # Plot pallet corners
         corner_x = [corner.x for corner in corners_3d]
@@ -1602,12 +1687,11 @@ class BaseGenerator:
             [3, 7],  # Vertical edges
         ]
 
-        for edge in edges:
-            start = corners_3d[edge[0]]
-            end = corners_3d[edge[1]]
-            ax.plot(
-                [start.x, end.x], [start.y, end.y], [start.z, end.z], "k-", alpha=0.3
-            )
+        # All 12 edges as one collection instead of one Line3D artist each
+        corners_arr = np.array([[c.x, c.y, c.z] for c in corners_3d])
+        ax.add_collection3d(
+            Line3DCollection(corners_arr[np.array(edges)], colors="k", alpha=0.3)
+        )
 
         # Get all faces and their centers
         all_faces = self.get_all_faces_from_bbox()
@@ -1665,16 +1749,15 @@ class BaseGenerator:
             )
 
         # Draw lines from camera to each corner for distance visualization
+        cam_arr = np.array([camera_pos.x, camera_pos.y, camera_pos.z])
+        rays = np.stack((np.broadcast_to(cam_arr, corners_arr.shape), corners_arr), 1)
+        ax.add_collection3d(
+            Line3DCollection(
+                rays, colors="r", linestyles="--", alpha=0.3, linewidths=0.5
+            )
+        )
         for _i, corner in enumerate(corners_3d):
             distance = (camera_pos - corner).length
-            ax.plot(
-                [camera_pos.x, corner.x],
-                [camera_pos.y, corner.y],
-                [camera_pos.z, corner.z],
-                "r--",
-                alpha=0.3,
-                linewidth=0.5,
-            )
             # Add distance labels
             mid_x = (camera_pos.x + corner.x) / 2
             mid_y = (camera_pos.y + corner.y) / 2
@@ -1693,17 +1776,10 @@ class BaseGenerator:
         ax.legend()
 
         # Set equal aspect ratio
-        max_range = np.array(
-            [
-                corner_x + [camera_pos.x],
-                corner_y + [camera_pos.y],
-                corner_z + [camera_pos.z],
-            ]
-        ).flatten()
-        max_range = max(max_range) - min(max_range)
-        mid_x = (max(corner_x + [camera_pos.x]) + min(corner_x + [camera_pos.x])) * 0.5
-        mid_y = (max(corner_y + [camera_pos.y]) + min(corner_y + [camera_pos.y])) * 0.5
-        mid_z = (max(corner_z + [camera_pos.z]) + min(corner_z + [camera_pos.z])) * 0.5
+        pts = np.vstack((corners_arr, cam_arr))
+        lo, hi = pts.min(axis=0), pts.max(axis=0)
+        max_range = hi.max() - lo.min()
+        mid_x, mid_y, mid_z = (hi + lo) * 0.5
 
         ax.set_xlim(mid_x - max_range / 2, mid_x + max_range / 2)
         ax.set_ylim(mid_y - max_range / 2, mid_y + max_range / 2)
@@ -1716,11 +1792,10 @@ class BaseGenerator:
         logger.debug(f"Saving 3D plot to: {output_path}")
 
         try:
-            plt.savefig(output_path, dpi=150, bbox_inches="tight")
+            fig.savefig(output_path, dpi=self.config.get("debug_3d_dpi", 100))
             logger.info(f"3D debug visualization saved to: {output_path}")
         except Exception as e:
             logger.error(f"Error saving 3D plot: {e}")
-            plt.close()
             return
 
         # Save interactive 3D figure using plotly (if available)
@@ -1735,8 +1810,6 @@ class BaseGenerator:
         except Exception as e:
             logger.warning(f"Could not save interactive figure: {e}")
 
-        plt.close()
-
         # Also save coordinate data as text file
         coord_file = os.path.join(
             self.paths["debug_3d_coordinates"], f"frame_{frame_id:06d}_coordinates.txt"
@@ -2494,7 +2567,10 @@ class BaseGenerator:
         faces = self.detect_faces_in_scene(cam_obj, sc)
 
         # Create 3D debug visualization AFTER face calculations are complete
-        if frame_id is not None:
+        # (can be turned off: matplotlib import and 3D plotting are costly)
+        if frame_id is not None and self.config.get(
+            "enable_3d_debug_visualization", True
+        ):
             logger.info(f"Creating 3D debug visualization for frame {frame_id}")
 
             pallet_objects_found = 0
@@ -2504,10 +2580,7 @@ class BaseGenerator:
                 ):
                     # Skip objects that might be bottom/top faces or other non-pallet objects
                     obj_name_lower = obj.name.lower()
-                    if any(
-                        skip_word in obj_name_lower
-                        for skip_word in ["down", "bottom", "top", "up", "face"]
-                    ):
+                    if _NON_PALLET_NAME_RE.search(obj_name_lower):
                         logger.debug(f"Skipping non-pallet object: {obj.name}")
                         continue
 
@@ -2558,6 +2631,7 @@ class BaseGenerator:
                     "bbox_3d": face_data["bbox_3d"],
                     "face_corners_3d": face_data["face_corners_3d"],
                     "keypoints": keypoints,
+                    "visible_count": sum(1 for kp in keypoints if kp["visible"]),
                 }
             )
 
@@ -6,13 +6,13 @@ from the original single pallet generator.
 """
 
 import contextlib
-import json
 import math
 import os
 import random
 import sys
 
 import bpy
+import numpy as np
 from mathutils import Euler, Matrix, Vector
 
 from .base_generator import BaseGenerator
@@ -144,6 +144,9 @@ class SinglePalletMode(BaseGenerator):
         if self.config.get("save_scene_before_render", False):
             self.save_generated_scene()
 
+        # Output format is the same for every frame
+        sc.render.image_settings.file_format = "PNG"
+
         print(f"🔄 Starting generation loop: {total} frames")
 
         # Main generation loop - exactly as in original
@@ -179,11 +182,8 @@ class SinglePalletMode(BaseGenerator):
                     f"🎯 Frame {valid}: Detected {len(keypoints_data)} faces with keypoints"
                 )
                 for face_data in keypoints_data:
-                    visible_kp = sum(
-                        1 for kp in face_data["keypoints"] if kp["visible"]
-                    )
                     print(
-                        f"   - {face_data['face_name']} face: {visible_kp}/6 keypoints visible"
+                        f"   - {face_data['face_name']} face: {face_data['visible_count']}/6 keypoints visible"
                     )
             else:
                 print(f"🎯 Frame {valid}: No faces detected for keypoints")
@@ -200,7 +200,6 @@ class SinglePalletMode(BaseGenerator):
             fn = f"{valid:06d}"
             img_path = os.path.join(self.paths["images"], f"{fn}.png")
             sc.render.filepath = img_path
-            sc.render.image_settings.file_format = "PNG"
             bpy.ops.render.render(write_still=True)
 
             # Generate all outputs (analysis, annotations, etc.)
@@ -229,6 +228,7 @@ class SinglePalletMode(BaseGenerator):
 
         # Write final outputs
         self.save_final_outputs(coco, meta)
+        self._close_debug_figure()
 
         return {
             "frames_generated": valid,
@@ -395,8 +395,7 @@ class SinglePalletMode(BaseGenerator):
         with contextlib.suppress(Exception):
             bpy.context.view_layer.update()
         try:
-            corners = [obj.matrix_world @ Vector(c) for c in obj.bound_box]
-            return min(c.z for c in corners)
+            return float(self._world_corners(obj)[:, 2].min())
         except Exception:
             return obj.location.z
 
@@ -439,20 +438,15 @@ class SinglePalletMode(BaseGenerator):
             return
 
         bpy.context.view_layer.update()
-        pallet_corners = [pallet.matrix_world @ Vector(c) for c in pallet.bound_box]
-        pallet_min_x = min(c.x for c in pallet_corners)
-        pallet_max_x = max(c.x for c in pallet_corners)
-        pallet_min_y = min(c.y for c in pallet_corners)
-        pallet_max_y = max(c.y for c in pallet_corners)
-        pallet_max_z = max(c.z for c in pallet_corners)
+        pallet_corners = self._world_corners(pallet)
+        pallet_min_x, pallet_min_y, _ = pallet_corners.min(axis=0)
+        pallet_max_x, pallet_max_y, pallet_max_z = pallet_corners.max(axis=0)
 
         target_width = pallet_max_x - pallet_min_x
         target_depth = pallet_max_y - pallet_min_y
 
-        ph_matrix = placeholder.matrix_world
-        ph_corners = [ph_matrix @ Vector(c) for c in placeholder.bound_box]
-        ph_min_z = min(c.z for c in ph_corners)
-        ph_max_z = max(c.z for c in ph_corners)
+        ph_z = self._world_corners(placeholder)[:, 2]
+        ph_min_z, ph_max_z = ph_z.min(), ph_z.max()
         base_height = ph_max_z - ph_min_z
 
         extra_h_min, extra_h_max = cfg.get(
@@ -520,13 +514,9 @@ class SinglePalletMode(BaseGenerator):
                     dup.matrix_world = Matrix.Identity(4)
                     bpy.context.view_layer.update()
 
-                    src_corners = [Vector(c) for c in src.bound_box]
-                    src_min_x = min(c.x for c in src_corners)
-                    src_max_x = max(c.x for c in src_corners)
-                    src_min_y = min(c.y for c in src_corners)
-                    src_max_y = max(c.y for c in src_corners)
-                    src_min_z = min(c.z for c in src_corners)
-                    src_max_z = max(c.z for c in src_corners)
+                    src_corners = np.asarray(src.bound_box)
+                    src_min_x, src_min_y, src_min_z = src_corners.min(axis=0)
+                    src_max_x, src_max_y, src_max_z = src_corners.max(axis=0)
 
                     src_width = max(1e-6, src_max_x - src_min_x)
                     src_depth = max(1e-6, src_max_y - src_min_y)
@@ -556,22 +546,15 @@ class SinglePalletMode(BaseGenerator):
                         target_x = cell_center_x + offset_x
                         target_y = cell_center_y + offset_y
                         prev_obj = cell_objects[-1]
-                        prev_corners = [
-                            prev_obj.matrix_world @ Vector(c)
-                            for c in prev_obj.bound_box
-                        ]
-                        prev_top_z = max(c.z for c in prev_corners)
+                        prev_top_z = self._world_corners(prev_obj)[:, 2].max()
                         stack_gap = random.uniform(0, cell_width * offset_factor * 0.2)
                         target_z = prev_top_z + stack_gap
 
-                    dup_corners = [dup.matrix_world @ Vector(c) for c in dup.bound_box]
-                    dup_center_x = (
-                        min(c.x for c in dup_corners) + max(c.x for c in dup_corners)
-                    ) / 2.0
-                    dup_center_y = (
-                        min(c.y for c in dup_corners) + max(c.y for c in dup_corners)
-                    ) / 2.0
-                    dup_min_z = min(c.z for c in dup_corners)
+                    dup_corners = self._world_corners(dup)
+                    dup_lo = dup_corners.min(axis=0)
+                    dup_hi = dup_corners.max(axis=0)
+                    dup_center_x, dup_center_y, _ = (dup_lo + dup_hi) / 2.0
+                    dup_min_z = dup_lo[2]
 
                     final_x = target_x - dup_center_x
                     final_y = target_y - dup_center_y
@@ -770,10 +753,7 @@ class SinglePalletMode(BaseGenerator):
                     else 0
                 ),
                 "keypoints_visible": (
-                    sum(
-                        sum(1 for kp in face_data["keypoints"] if kp["visible"])
-                        for face_data in keypoints_data
-                    )
+                    sum(face_data["visible_count"] for face_data in keypoints_data)
                     if keypoints_data
                     else 0
                 ),
@@ -794,9 +774,7 @@ class SinglePalletMode(BaseGenerator):
                             "face_name": face_data["face_name"],
                             "face_index": face_data["face_index"],
                             "keypoints_count": len(face_data["keypoints"]),
-                            "visible_keypoints": sum(
-                                1 for kp in face_data["keypoints"] if kp["visible"]
-                            ),
+                            "visible_keypoints": face_data["visible_count"],
                             "keypoints": [
                                 {
                                     "name": kp["name"],
@@ -864,18 +842,6 @@ class SinglePalletMode(BaseGenerator):
                 f.write("\n".join(yolo_lines) + "\n")
         return ann_id
 
-    def save_final_outputs(self, coco, meta):
-        """Save final COCO and metadata files."""
-        root = self.config["output_dir"]
-
-        with open(os.path.join(root, "annotations_coco.json"), "w") as jf:
-            json.dump(coco, jf, indent=2)
-
-        with open(os.path.join(root, "dataset_manifest.json"), "w") as mf:
-            json.dump({"config": self.config, "frames": meta}, mf, indent=2)
-
-        print("✅ COCO / YOLO / VOC annotations written.")
-
     def apply_initial_transform(self, pallets, base_mat):
         """Apply random initial transform to pallets."""
         t = Matrix.Translation(
@@ -961,10 +927,7 @@ class SinglePalletMode(BaseGenerator):
             }
 
             info_path = scenes_folder / f"single_pallet_{batch_name}_info.json"
-            with open(info_path, "w") as f:
-                import json
-
-                json.dump(scene_info, f, indent=2)
+            self._write_json(info_path, scene_info)
 
         except Exception as e:
             print(f"⚠️  Failed to save generated scene: {e}")
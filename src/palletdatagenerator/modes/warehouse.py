@@ -13,6 +13,7 @@ import random
 import bpy
 import numpy as np
 from mathutils import Euler, Vector
+from mathutils.kdtree import KDTree
 
 from .base_generator import BaseGenerator
 
@@ -32,25 +33,39 @@ class WarehouseMode(BaseGenerator):
         super().__init__(config)
         self.mode_name = "warehouse"
         self.attached_group_prefix = "AttachedGroup_"
+        # Per-box placement traces (hundreds of lines per scene) are opt-in
+        self.verbose_placement = config.get("verbose_placement", False)
+        # World bounds / oriented boxes of static objects, keyed by name;
+        # reset per scene
+        self._bbox_cache = {}
+        self._bbox_3d_cache = {}
+        # (pallet list, (P, 3) locations) of the scene's pallets, reset per scene
+        self._pallet_xyz = None
+        self._pallet_kd = None
+        # Box template objects and group configurations, built once per run
+        self._box_templates = None
+        self._group_configs = None
+        self._rng = np.random.default_rng()
 
     def generate_frames(self):
         """
         Main warehouse generation loop exactly as in original warehouse_generator.py
         """
-        print("🏭 Starting warehouse generation...")
-        import sys
+        print("🏭 Starting warehouse generation...", flush=True)
 
-        sys.stdout.flush()
-
-        # Initialization
-        random.seed()
-        np.random.seed()
+        # Initialization (an optional "seed" in the config makes runs repeatable)
+        seed = self.config.get("seed")
+        random.seed(seed)
+        np.random.seed(seed)
+        self._rng = np.random.default_rng(seed)
 
         # Setup camera
         sc = bpy.context.scene
-        if sc.camera:
-            with contextlib.suppress(Exception):
-                bpy.data.objects.remove(sc.camera, do_unlink=True)
+        old_cam = sc.camera
+        if old_cam is not None:
+            # Already freed/linked elsewhere: RuntimeError or ReferenceError
+            with contextlib.suppress(RuntimeError, ReferenceError):
+                bpy.data.objects.remove(old_cam, do_unlink=True)
 
         cam_data = bpy.data.cameras.new("WarehouseCam")
         cam_obj = bpy.data.objects.new("WarehouseCam", cam_data)
@@ -87,6 +102,9 @@ class WarehouseMode(BaseGenerator):
         total_images = 0
         meta = []
 
+        # Output format is the same for every frame
+        sc.render.image_settings.file_format = "PNG"
+
         # Main generation loop - multiple scenes
         for scene_id in range(self.config["num_scenes"]):
             print(f"\n--- SCENE {scene_id + 1}/{self.config['num_scenes']} ---")
@@ -124,20 +142,22 @@ class WarehouseMode(BaseGenerator):
                 self.config["max_total_images"] - total_images,
             )
 
+            # Camera poses for every image of the scene, forklift-like movement
+            progresses = np.arange(scene_images) / max(1, scene_images - 1)
+            camera_frames = self.precompute_camera_frames(camera_path, progresses)
+
             # Generate images along the path
             for img_id in range(scene_images):
                 frame_id = total_images
 
+                # Flushed so the CLI shows progress before the (long) render
                 print(
-                    f"📸 Rendering frame {frame_id + 1}/{self.config['max_total_images']} (Scene {scene_id + 1}, Image {img_id + 1}/{scene_images})"
+                    f"📸 Rendering frame {frame_id + 1}/{self.config['max_total_images']} (Scene {scene_id + 1}, Image {img_id + 1}/{scene_images})",
+                    flush=True,
                 )
-                import sys
-
-                sys.stdout.flush()
 
-                # Position camera with forklift-like movement
-                progress = img_id / max(1, scene_images - 1)
-                self.position_camera_on_path(cam_obj, camera_path, progress)
+                # Position camera on its precomputed path pose
+                self.apply_camera_frame(cam_obj, camera_frames[img_id])
 
                 # Dynamic lighting
                 self.randomize_lighting()
@@ -156,7 +176,6 @@ class WarehouseMode(BaseGenerator):
                 img_filename = f"{frame_id:06d}.png"
                 img_path = os.path.join(self.paths["images"], img_filename)
                 sc.render.filepath = img_path
-                sc.render.image_settings.file_format = "PNG"
 
                 try:
                     bpy.ops.render.render(write_still=True)
@@ -190,6 +209,7 @@ class WarehouseMode(BaseGenerator):
 
         # Save final outputs
         self.save_final_outputs(coco_data, meta)
+        self._close_debug_figure()
 
         print("\n🎉 WAREHOUSE DATASET GENERATED!")
         print(f"📊 Images generated: {total_images}")
@@ -205,10 +225,17 @@ class WarehouseMode(BaseGenerator):
         """Find and categorize warehouse objects by collections (object.XXX structure)."""
         objects = {"pallets": [], "boxes": [], "other": [], "collections": {}}
 
-        # First pass: find individual objects
+        collection_groups = {}
+
+        # Single pass over meshes: individual objects and collection groups
         for obj in bpy.data.objects:
-            if obj.type == "MESH" and obj.visible_get():
-                name_lower = obj.name.lower()
+            if obj.type != "MESH":
+                continue
+            name = obj.name
+
+            # Individual objects
+            if obj.visible_get():
+                name_lower = name.lower()
                 if "pallet" in name_lower:
                     objects["pallets"].append(obj)
                 elif "box" in name_lower or "create" in name_lower:
@@ -216,37 +243,29 @@ class WarehouseMode(BaseGenerator):
                 else:
                     objects["other"].append(obj)
 
-        # Second pass: find collection-based groups (object.XXX pattern)
-        collection_groups = {}
+            # Collection-based groups (object.XXX pattern)
+            base, sep, group_id = name.partition(".")
+            if sep:  # group_id could be "001" or more complex
+                base_name = base.lower()
+
+                # Initialize collection group if not exists
+                if group_id not in collection_groups:
+                    collection_groups[group_id] = {
+                        "pallets": [],
+                        "boxes": [],
+                        "other": [],
+                        "group_id": group_id,
+                    }
 
-        for obj in bpy.data.objects:
-            if obj.type == "MESH":
-                # Look for collection-based naming patterns
-                parts = obj.name.split(".")
-                if len(parts) >= 2:
-                    base_name = parts[0].lower()
-                    group_id = ".".join(parts[1:])  # Could be "001" or more complex
-
-                    # Initialize collection group if not exists
-                    if group_id not in collection_groups:
-                        collection_groups[group_id] = {
-                            "pallets": [],
-                            "boxes": [],
-                            "other": [],
-                            "group_id": group_id,
-                        }
-
-                    # Categorize by base name
-                    if "pallet" in base_name:
-                        collection_groups[group_id]["pallets"].append(obj)
-                        print(
-                            f"📦 Found collection pallet: {obj.name} in group {group_id}"
-                        )
-                    elif "box" in base_name:
-                        collection_groups[group_id]["boxes"].append(obj)
-                        print(f"📦 Found collection box: {obj.name} in group {group_id}")
-                    else:
-                        collection_groups[group_id]["other"].append(obj)
+                # Categorize by base name
+                if "pallet" in base_name:
+                    collection_groups[group_id]["pallets"].append(obj)
+                    print(f"📦 Found collection pallet: {obj.name} in group {group_id}")
+                elif "box" in base_name:
+                    collection_groups[group_id]["boxes"].append(obj)
+                    print(f"📦 Found collection box: {obj.name} in group {group_id}")
+                else:
+                    collection_groups[group_id]["other"].append(obj)
 
         objects["collections"] = collection_groups
 
@@ -263,103 +282,102 @@ class WarehouseMode(BaseGenerator):
         return objects
 
     def generate_warehouse_path(self, scene_objects):
-        """Generate a forklift-like camera path through the warehouse."""
+        """Generate a forklift-like camera path through the warehouse.
+
+        Returns an (N, 6) array of waypoints: position xyz then Euler xyz.
+        """
         pallets = scene_objects["pallets"]
         if not pallets:
             # Fallback path
-            return [
-                {"position": Vector((0, 0, 1.6)), "rotation": Euler((0, 0, 0))},
-                {"position": Vector((5, 0, 1.6)), "rotation": Euler((0, 0, 0))},
-            ]
+            return np.array([(0, 0, 1.6, 0, 0, 0), (5, 0, 1.6, 0, 0, 0)], dtype=float)
 
         # Calculate warehouse bounds
-        all_positions = [p.location for p in pallets]
-        min_x = min(pos.x for pos in all_positions) - 5
-        max_x = max(pos.x for pos in all_positions) + 5
-        min_y = min(pos.y for pos in all_positions) - 5
-        max_y = max(pos.y for pos in all_positions) + 5
+        all_positions = self._pallet_locations(pallets)
+        min_x, min_y = all_positions[:, :2].min(axis=0) - 5
+        max_x, max_y = all_positions[:, :2].max(axis=0) + 5
 
         # Generate forklift path points
-        path = []
         camera_height = self.config.get("camera_height_range", (1.4, 2.0))
 
         # Create a path that moves through the warehouse
         num_points = max(10, self.config["max_total_images"] // 2)
 
-        for i in range(num_points):
-            # Forklift-like movement pattern
-            x = min_x + (max_x - min_x) * (i / (num_points - 1))
-            y = min_y + (max_y - min_y) * (0.3 + 0.4 * math.sin(i * 0.5))
-            z = random.uniform(*camera_height)
+        # Forklift-like movement pattern, sampled for all points at once
+        i = np.arange(num_points)
+        xs = np.linspace(min_x, max_x, num_points)
+        ys = min_y + (max_y - min_y) * (0.3 + 0.4 * np.sin(i * 0.5))
+        zs = self._rng.uniform(*camera_height, size=num_points)
 
-            # Add some randomness for realistic movement
-            x += random.uniform(-0.5, 0.5)
-            y += random.uniform(-0.5, 0.5)
+        # Add some randomness for realistic movement
+        jitter = self._rng.uniform(-0.5, 0.5, size=(2, num_points))
+        xs += jitter[0]
+        ys += jitter[1]
 
-            position = Vector((x, y, z))
+        # Look towards nearby pallets: nearest pallet for every point in one pass
+        points = np.column_stack((xs, ys, zs))
+        nearest = self._nearest_indices(points, all_positions)
 
-            # Look towards nearby pallets
-            look_target = self.find_nearest_pallet(position, pallets)
-            look_dir = (look_target - position).normalized()
-            rotation = look_dir.to_track_quat("-Z", "Y").to_euler()
+        # Camera (-Z forward, Y up) look-at as XYZ Euler: pitch about X, then yaw
+        look = all_positions[nearest] - points
+        pitch = np.arctan2(np.hypot(look[:, 0], look[:, 1]), -look[:, 2])
+        yaw = np.arctan2(-look[:, 0], look[:, 1])
 
-            path.append({"position": position, "rotation": rotation})
+        return np.column_stack((points, pitch, np.zeros(num_points), yaw))
 
-        return path
-
-    def find_nearest_pallet(self, position, pallets):
-        """Find the nearest pallet to look at."""
-        if not pallets:
-            return Vector((0, 0, 0))
+    def _pallet_locations(self, pallets):
+        """Return the locations of ``pallets`` as a (P, 3) array.
 
-        nearest_dist = float("inf")
-        nearest_pallet = pallets[0]
+        Cached per scene for the list object it was built from; any other list
+        gets its own array.
+        """
+        if self._pallet_xyz is None or self._pallet_xyz[0] is not pallets:
+            self._pallet_xyz = (pallets, np.array([p.location for p in pallets]))
+        return self._pallet_xyz[1]
 
-        for pallet in pallets:
-            dist = (pallet.location - position).length
-            if dist < nearest_dist:
-                nearest_dist = dist
-                nearest_pallet = pallet
+    def _nearest_indices(self, points, locations):
+        """Index of the closest row of ``locations`` (P, 3) for each of ``points`` (N, 3)."""
+        deltas = points[:, None, :] - locations[None, :, :]
+        return np.einsum("npk,npk->np", deltas, deltas).argmin(axis=1)
 
-        return Vector(nearest_pallet.location)
+    def precompute_camera_frames(self, camera_path, progresses):
+        """Interpolate and jitter camera poses for all ``progresses`` at once.
 
-    def position_camera_on_path(self, cam_obj, camera_path, progress):
-        """Position camera along the forklift path with realistic movement."""
-        if not camera_path:
-            return
+        Returns an (N, 6) array of poses in the same layout as the path.
+        """
+        progresses = np.asarray(progresses, dtype=float)
+        last = len(camera_path) - 1
 
         # Interpolate along path
-        path_index = progress * (len(camera_path) - 1)
-        index_low = int(path_index)
-        index_high = min(index_low + 1, len(camera_path) - 1)
-        lerp_factor = path_index - index_low
-
-        if index_low == index_high:
-            point = camera_path[index_low]
-        else:
-            point_low = camera_path[index_low]
-            point_high = camera_path[index_high]
-
-            # Interpolate position and rotation
-            position = point_low["position"].lerp(point_high["position"], lerp_factor)
-
-            # Add forklift-like jitter
+        path_index = progresses * last
+        index_low = path_index.astype(int)
+        index_high = np.minimum(index_low + 1, last)
+        lerp_factor = (path_index - index_low)[:, None]
+
+        # Interpolate position (rotation follows the lower waypoint)
+        frames = camera_path[index_low].copy()
+        frames[:, :3] += (camera_path[index_high, :3] - frames[:, :3]) * lerp_factor
+
+        # Add forklift-like jitter, except when sitting on the last waypoint
+        moving = index_low != index_high
+        n = int(moving.sum())
+        if n:
             lateral_jitter = self.config.get("camera_lateral_jitter_m", 0.15)
             yaw_jitter = self.config.get("camera_yaw_jitter_deg", 3.0)
             pitch_range = self.config.get("camera_pitch_deg_range", (-3.0, 8.0))
 
-            position.x += random.uniform(-lateral_jitter, lateral_jitter)
-            position.y += random.uniform(-lateral_jitter, lateral_jitter)
-
-            rotation = point_low["rotation"].copy()
-            rotation.z += math.radians(random.uniform(-yaw_jitter, yaw_jitter))
-            rotation.x += math.radians(random.uniform(*pitch_range))
+            rng = self._rng
+            frames[moving, :2] += rng.uniform(
+                -lateral_jitter, lateral_jitter, size=(n, 2)
+            )
+            frames[moving, 5] += np.radians(rng.uniform(-yaw_jitter, yaw_jitter, n))
+            frames[moving, 3] += np.radians(rng.uniform(*pitch_range, n))
 
-            point = {"position": position, "rotation": rotation}
+        return frames
 
-        # Apply to camera
-        cam_obj.location = point["position"]
-        cam_obj.rotation_euler = point["rotation"]
+    def apply_camera_frame(self, cam_obj, frame):
+        """Apply one precomputed (6,) camera pose to the camera."""
+        cam_obj.location = frame[:3]
+        cam_obj.rotation_euler = frame[3:]
 
     def randomize_scene_objects(self, scene_objects):
         """Randomize scene objects and replace hidden boxes with generated groups - collection-aware approach."""
@@ -368,16 +386,16 @@ class WarehouseMode(BaseGenerator):
         original_positions = {}
 
         print("=== DÉBUT RANDOMISATION COLLECTION-AWARE ===")
+        self._bbox_cache.clear()
+        self._bbox_3d_cache.clear()
+        self._pallet_xyz = None
+        self._pallet_kd = None
 
-        # Find box templates (box1, box2, box3)
-        box_templates = []
-        print("🔍 Searching for box templates...")
-        for obj in bpy.data.objects:
-            if obj.type == "MESH" and obj.name in ["box1", "box2", "box3"]:
-                box_templates.append(obj)
-                print(
-                    f"✅ Template found: {obj.name} at {obj.location} (visible: {obj.visible_get()})"
-                )
+        # Find box templates (box1, box2, box3) once; the templates are never
+        # removed, only copied
+        if self._box_templates is None:
+            self._box_templates = self._find_box_templates()
+        box_templates = list(self._box_templates)
 
         print(f"Total templates box found: {len(box_templates)}")
         if not box_templates:
@@ -399,8 +417,11 @@ class WarehouseMode(BaseGenerator):
         # Clean up previously generated boxes
         self.cleanup_generated_boxes()
 
-        # Create 5 different box groups (from original)
-        group_configs = self._create_5_different_box_groups(box_templates)
+        # Create 5 different box groups (from original); they are static, so
+        # build them once per run
+        if self._group_configs is None:
+            self._group_configs = self._create_5_different_box_groups(box_templates)
+        group_configs = self._group_configs
 
         # Process collection groups - replace hidden boxes with generated groups
         box_removal_prob = self.config.get("box_removal_probability", 0.7)
@@ -408,14 +429,32 @@ class WarehouseMode(BaseGenerator):
 
         replacement_count = 0
 
+        all_boxes = [
+            *scene_objects["boxes"],
+            *(
+                box
+                for group in scene_objects["collections"].values()
+                for box in group["boxes"]
+            ),
+        ]
+        # Lower-cased names for the template check, once per box this call
+        lower_names = {box.as_pointer(): box.name.lower() for box in all_boxes}
+
+        # One removal draw and one group choice per box, drawn up front
+        total_boxes = len(all_boxes)
+        remove_draws = self._rng.random(total_boxes) < box_removal_prob
+        config_draws = self._rng.integers(len(group_configs), size=total_boxes)
+        draw = -1
+
         for group_id, collection_group in scene_objects["collections"].items():
             print(f"\n🎯 Processing collection group: {group_id}")
 
             # Process boxes in this collection
             for box in collection_group["boxes"]:
+                draw += 1
                 if (
-                    box.name.lower() not in templates_to_keep
-                    and random.random() < box_removal_prob
+                    lower_names[box.as_pointer()] not in templates_to_keep
+                    and remove_draws[draw]
                 ):
                     print(f"  📦 Hiding box: {box.name}")
                     removed_objects.append(box)
@@ -436,7 +475,7 @@ class WarehouseMode(BaseGenerator):
                         )
 
                         # Choose random group configuration
-                        group_config = random.choice(group_configs)
+                        group_config = group_configs[config_draws[draw]]
 
                         # Generate replacement group using box's original position/scale as reference
                         try:
@@ -465,9 +504,10 @@ class WarehouseMode(BaseGenerator):
 
         # Also process individual boxes (not in collections)
         for box in scene_objects["boxes"]:
+            draw += 1
             if (
-                box.name.lower() not in templates_to_keep
-                and random.random() < box_removal_prob
+                lower_names[box.as_pointer()] not in templates_to_keep
+                and remove_draws[draw]
             ):
                 print(f"📦 Hiding individual box: {box.name}")
                 removed_objects.append(box)
@@ -480,7 +520,7 @@ class WarehouseMode(BaseGenerator):
                     box, scene_objects["pallets"]
                 )
                 if nearest_pallet:
-                    group_config = random.choice(group_configs)
+                    group_config = group_configs[config_draws[draw]]
                     try:
                         replacement_boxes = self._generate_replacement_box_group(
                             box,
@@ -499,6 +539,19 @@ class WarehouseMode(BaseGenerator):
         print(f"\n🎉 Randomization complete: {replacement_count} box groups generated")
         return removed_objects, modified_objects, original_positions
 
+    def _find_box_templates(self):
+        """Look up the box1/box2/box3 template meshes by name."""
+        box_templates = []
+        print("🔍 Searching for box templates...")
+        for name in ("box1", "box2", "box3"):
+            obj = bpy.data.objects.get(name)
+            if obj is not None and obj.type == "MESH":
+                box_templates.append(obj)
+                print(
+                    f"✅ Template found: {obj.name} at {obj.location} (visible: {obj.visible_get()})"
+                )
+        return box_templates
+
     def _is_box_on_pallet(self, box, pallet):
         """Check if a box is positioned on top of a pallet."""
         # Simple distance check - box should be close to pallet XY and above it
@@ -565,9 +618,6 @@ class WarehouseMode(BaseGenerator):
             },
         ]
 
-        for config in group_configs:
-            config["box_templates"] = box_templates.copy()
-
         print(f"✅ {len(group_configs)} group configurations created")
         return group_configs
 
@@ -576,16 +626,15 @@ class WarehouseMode(BaseGenerator):
         if not pallets:
             return None
 
-        min_distance = float("inf")
-        nearest_pallet = None
-
-        for pallet in pallets:
-            distance = (box.location - pallet.location).length
-            if distance < min_distance:
-                min_distance = distance
-                nearest_pallet = pallet
+        if self._pallet_kd is None:
+            # Built once per scene, then O(log P) per box
+            self._pallet_kd = KDTree(len(pallets))
+            for i, pallet in enumerate(pallets):
+                self._pallet_kd.insert(pallet.location, i)
+            self._pallet_kd.balance()
 
-        return nearest_pallet
+        _co, idx, _dist = self._pallet_kd.find(box.location)
+        return pallets[idx]
 
     def _generate_replacement_box_group(
         self, original_box, target_pallet, group_config, box_templates, group_id
@@ -617,18 +666,12 @@ class WarehouseMode(BaseGenerator):
             # Measures palette - EXACT from original with validation
             bpy.context.view_layer.update()
             try:
-                world_corners = [
-                    pallet.matrix_world @ Vector(c) for c in pallet.bound_box
-                ]
-                pallet_top_z = max(c.z for c in world_corners)
+                pallet_top_z = self._cached_bounding_box(pallet)["max_z"]
 
                 # bornes locales (pour grille)
-                pxs = [v[0] for v in pallet.bound_box]
-                pys = [v[1] for v in pallet.bound_box]
-                pzs = [v[2] for v in pallet.bound_box]
-                pl_min_x, pl_max_x = min(pxs), max(pxs)
-                pl_min_y, pl_max_y = min(pys), max(pys)
-                pl_top_z = max(pzs)
+                local = np.asarray(pallet.bound_box, dtype=np.float64)
+                pl_min_x, pl_min_y, _ = local.min(axis=0)
+                pl_max_x, pl_max_y, pl_top_z = local.max(axis=0)
 
                 # Validate bounds to prevent degenerate dimensions
                 if abs(pl_max_x - pl_min_x) < 0.1:
@@ -654,7 +697,10 @@ class WarehouseMode(BaseGenerator):
             top_w_local = pl_max_x - pl_min_x
             top_d_local = pl_max_y - pl_min_y
 
-            print(f"  Pallet dimensions: {top_w_local:.3f} x {top_d_local:.3f} (local)")
+            if self.verbose_placement:
+                print(
+                    f"  Pallet dimensions: {top_w_local:.3f} x {top_d_local:.3f} (local)"
+                )
 
             if random.random() < 0.5:
                 if abs(top_w_local) >= abs(top_d_local):
@@ -667,29 +713,55 @@ class WarehouseMode(BaseGenerator):
             cell_width_local = (pl_max_x - pl_min_x) / grid_x
             cell_depth_local = (pl_max_y - pl_min_y) / grid_y
 
-            print(
-                f"  Grid: {grid_x}x{grid_y}, cell size: {cell_width_local:.3f} x {cell_depth_local:.3f}"
-            )
+            if self.verbose_placement:
+                print(
+                    f"  Grid: {grid_x}x{grid_y}, cell size: {cell_width_local:.3f} x {cell_depth_local:.3f}"
+                )
 
             created_objects = []
             obj_index = 0
-            placed_positions = []  # Track positions to prevent overlap
+            # Track XY positions to prevent overlap
+            placed_xy = np.empty((grid_x * grid_y, 2))
+            # One template draw per cell
+            template_idx = self._rng.integers(len(box_templates), size=grid_x * grid_y)
+
+            # Pallet orientation and template sizes (never zero) do not change
+            # while placing
+            pallet_yaw = pallet.rotation_euler.z
+            template_dims = {
+                template.name: (
+                    max(0.01, getattr(template.dimensions, "x", 0.1)),
+                    max(0.01, getattr(template.dimensions, "y", 0.1)),
+                )
+                for template in box_templates
+            }
+
+            # Centres de cellule en local -> monde, whole grid at once
+            local_centers = self._grid_cell_centers(
+                pl_min_x,
+                pl_min_y,
+                cell_width_local,
+                cell_depth_local,
+                pl_top_z,
+                grid_x,
+                grid_y,
+            )
+            world_centers = self._local_to_world(pallet, local_centers)
 
             for row in range(grid_y):
                 for col in range(grid_x):
-                    # Centre de cellule en local -> monde - EXACT from original
-                    local_cx = pl_min_x + (col + 0.5) * cell_width_local
-                    local_cy = pl_min_y + (row + 0.5) * cell_depth_local
-                    local_pos = Vector((local_cx, local_cy, pl_top_z))
-                    world_pos = pallet.matrix_world @ local_pos
+                    local_cx, local_cy, _ = local_centers[obj_index]
+                    world_pos = Vector(world_centers[obj_index])
 
-                    print(
-                        f"      Cell [{row},{col}]: local({local_cx:.2f}, {local_cy:.2f}, {pl_top_z:.2f}) → world({world_pos.x:.2f}, {world_pos.y:.2f}, {world_pos.z:.2f})"
-                    )
+                    if self.verbose_placement:
+                        print(
+                            f"      Cell [{row},{col}]: local({local_cx:.2f}, {local_cy:.2f}, {pl_top_z:.2f}) → world({world_pos.x:.2f}, {world_pos.y:.2f}, {world_pos.z:.2f})"
+                        )
 
-                    template = random.choice(box_templates)
-                    box = template.copy()
-                    box.data = template.data.copy()
+                    template = box_templates[template_idx[obj_index]]
+                    box = template.copy()  # shares the template mesh
+                    if self.config.get("unique_mesh_per_box", False):
+                        box.data = template.data.copy()
                     box.name = f"{self.attached_group_prefix}G{group_data['id']}_{obj_index}_L0_{template.name}_{group_id}"
                     self._add_box_to_collection_exact(box, boxes_collection)
 
@@ -700,32 +772,25 @@ class WarehouseMode(BaseGenerator):
                     initial_pos = Vector((world_pos.x, world_pos.y, safe_z))
                     box.location = initial_pos
 
-                    # Check for overlap with existing boxes
+                    # Check for overlap with existing boxes, all at once
                     min_distance = 0.1  # Minimum distance between box centers
-                    for prev_pos in placed_positions:
-                        distance = (
-                            Vector((initial_pos.x, initial_pos.y))
-                            - Vector((prev_pos.x, prev_pos.y))
-                        ).length
-                        if distance < min_distance:
-                            # Adjust position to avoid overlap
-                            offset = Vector((0.1 * col, 0.1 * row))
-                            initial_pos += offset
-                            box.location = initial_pos
-                            print(
-                                f"      ⚠️ Overlap detected, adjusted position by {offset}"
-                            )
-                            break
+                    deltas = placed_xy[:obj_index] - (initial_pos.x, initial_pos.y)
+                    if (np.einsum("ij,ij->i", deltas, deltas) < min_distance**2).any():
+                        # Adjust position to avoid overlap
+                        offset = Vector((0.1 * col, 0.1 * row, 0.0))
+                        initial_pos += offset
+                        box.location = initial_pos
+                        print(
+                            f"      ⚠️ Overlap detected, adjusted position by {offset}"
+                        )
 
-                    placed_positions.append(initial_pos)
-                    print(f"      Initial position: {box.location}")
+                    placed_xy[obj_index] = initial_pos.x, initial_pos.y
+                    if self.verbose_placement:
+                        print(f"      Initial position: {box.location}")
 
                     # Orientation + scale par axe pour remplir la cellule - EXACT from original with safety
                     try:
-                        dim_x = max(
-                            0.01, getattr(template.dimensions, "x", 0.1)
-                        )  # Prevent zero dimensions
-                        dim_y = max(0.01, getattr(template.dimensions, "y", 0.1))
+                        dim_x, dim_y = template_dims[template.name]
 
                         # 0° vs 90° (choix qui fitte le mieux)
                         sx0 = abs(cell_width_local) / dim_x
@@ -735,10 +800,10 @@ class WarehouseMode(BaseGenerator):
 
                         use_90 = (sx90 * sy90) > (sx0 * sy0)
                         if use_90:
-                            yaw = pallet.rotation_euler.z + math.pi / 2
+                            yaw = pallet_yaw + math.pi / 2
                             scale_x, scale_y = sx90, sy90
                         else:
-                            yaw = pallet.rotation_euler.z
+                            yaw = pallet_yaw
                             scale_x, scale_y = sx0, sy0
 
                         # CONSERVATIVE scaling to prevent collapse - much tighter limits
@@ -751,51 +816,40 @@ class WarehouseMode(BaseGenerator):
                             scale_y = min(2.0, scale_y)
                             print("      📏 Applied conservative scaling limit")
 
-                        print(
-                            f"      Scaling: template_dim({dim_x:.2f}, {dim_y:.2f}) → scale({scale_x:.2f}, {scale_y:.2f}) {'90°' if use_90 else '0°'}"
-                        )
+                        if self.verbose_placement:
+                            print(
+                                f"      Scaling: template_dim({dim_x:.2f}, {dim_y:.2f}) → scale({scale_x:.2f}, {scale_y:.2f}) {'90°' if use_90 else '0°'}"
+                            )
 
                     except Exception as e:
                         print(f"      ⚠️ Scaling error: {e}")
-                        yaw = pallet.rotation_euler.z
+                        yaw = pallet_yaw
                         scale_x = scale_y = 1.0
 
                     # SAFE ORDER: Apply scale and rotation
                     box.scale = Vector((scale_x, scale_y, 1.0))
                     box.rotation_euler = Euler((0, 0, yaw))
 
-                    # Update transforms to ensure proper dimensions calculation
-                    bpy.context.view_layer.update()
-
-                    # SAFE ORDER: Align bottom to pallet top with generous margin
-                    try:
-                        self._align_bottom_to_z(box, pallet_top_z, margin=0.03)
-                    except Exception as e:
-                        print(
-                            f"      ⚠️ Alignment error: {e}, using manual positioning"
-                        )
-                        # Manual fallback positioning
-                        box.location.z = pallet_top_z + 0.05
-
-                    # Update transforms again before parenting
-                    bpy.context.view_layer.update()
-
-                    # SAFE ORDER: Parent while preserving world position
-                    try:
-                        self._parent_preserve_world(box, pallet)
-                    except Exception as e:
-                        print(f"      ⚠️ Parenting error: {e}")
-                        # Manual parenting fallback
-                        box.parent = pallet
-
-                    # Final update and visibility
-                    bpy.context.view_layer.update()
+                    # Visibility (one scene update after the whole group)
                     box.hide_viewport = False
                     box.hide_render = False
 
                     created_objects.append(box)
                     obj_index += 1
 
+            # SAFE ORDER: Align bottoms to pallet top with generous margin, for
+            # the whole group at once
+            self._align_bottoms_to_z(created_objects, pallet_top_z, margin=0.03)
+
+            # SAFE ORDER: Parent while preserving world position
+            for box in created_objects:
+                try:
+                    self._parent_preserve_world(box, pallet)
+                except Exception as e:
+                    print(f"      ⚠️ Parenting error: {e}")
+                    # Manual parenting fallback
+                    box.parent = pallet
+
             # Final scene update
             bpy.context.view_layer.update()
             print(
@@ -810,6 +864,19 @@ class WarehouseMode(BaseGenerator):
             traceback.print_exc()
             return []
 
+    def _grid_cell_centers(
+        self, min_x, min_y, cell_width, cell_depth, z, grid_x, grid_y
+    ):
+        """Local (x, y, z) centres of a grid_x x grid_y grid of cells, row by row."""
+        rows, cols = np.divmod(np.arange(grid_x * grid_y), grid_x)
+        return np.column_stack(
+            (
+                min_x + (cols + 0.5) * cell_width,
+                min_y + (rows + 0.5) * cell_depth,
+                np.full(grid_x * grid_y, z),
+            )
+        )
+
     def _create_boxes_collection_for_pallet_exact(self, pallet, group_id):
         """Create collection for pallet boxes - adapted for collection-aware structure."""
         collection_name = f"boxes_group_{pallet.name}_{group_id}"
@@ -888,18 +955,12 @@ class WarehouseMode(BaseGenerator):
             bpy.context.view_layer.update()
 
             try:
-                world_corners = [
-                    pallet.matrix_world @ Vector(c) for c in pallet.bound_box
-                ]
-                pallet_top_z = max(c.z for c in world_corners)
+                pallet_top_z = self._cached_bounding_box(pallet)["max_z"]
 
                 # Local bounds for grid calculation
-                pxs = [v[0] for v in pallet.bound_box]
-                pys = [v[1] for v in pallet.bound_box]
-                pzs = [v[2] for v in pallet.bound_box]
-                pl_min_x, pl_max_x = min(pxs), max(pxs)
-                pl_min_y, pl_max_y = min(pys), max(pys)
-                pl_top_z = max(pzs)
+                local = np.asarray(pallet.bound_box, dtype=np.float64)
+                pl_min_x, pl_min_y, _ = local.min(axis=0)
+                pl_max_x, pl_max_y, pl_top_z = local.max(axis=0)
             except Exception:
                 # Fallback if bound_box fails
                 pallet_top_z = pallet.location.z + getattr(pallet.dimensions, "z", 0.15)
@@ -926,24 +987,37 @@ class WarehouseMode(BaseGenerator):
             cell_width_local = (pl_max_x - pl_min_x) / grid_x
             cell_depth_local = (pl_max_y - pl_min_y) / grid_y
 
-            print(f"  Grille: {grid_y}x{grid_x} sur palette {pallet.name}")
+            if self.verbose_placement:
+                print(f"  Grille: {grid_y}x{grid_x} sur palette {pallet.name}")
 
             created_objects = []
             obj_index = 0
+            # One template draw per cell
+            template_idx = self._rng.integers(len(box_templates), size=grid_x * grid_y)
+
+            # Cell centers in local coordinates -> world coordinates, whole grid at once
+            local_centers = self._grid_cell_centers(
+                pl_min_x,
+                pl_min_y,
+                cell_width_local,
+                cell_depth_local,
+                pl_top_z,
+                grid_x,
+                grid_y,
+            )
+            world_centers = self._local_to_world(pallet, local_centers)
 
             # Place boxes in grid - EXACT original logic
-            for row in range(grid_y):
-                for col in range(grid_x):
-                    # Cell center in local coordinates -> world coordinates
-                    local_cx = pl_min_x + (col + 0.5) * cell_width_local
-                    local_cy = pl_min_y + (row + 0.5) * cell_depth_local
-                    local_pos = Vector((local_cx, local_cy, pl_top_z))
-                    world_pos = pallet.matrix_world @ local_pos
+            for _row in range(grid_y):
+                for _col in range(grid_x):
+                    local_cx, local_cy, _ = local_centers[obj_index]
+                    world_pos = Vector(world_centers[obj_index])
 
                     # Create box from template
-                    template = random.choice(box_templates)
-                    box = template.copy()
-                    box.data = template.data.copy()
+                    template = box_templates[template_idx[obj_index]]
+                    box = template.copy()  # shares the template mesh
+                    if self.config.get("unique_mesh_per_box", False):
+                        box.data = template.data.copy()
                     box.name = (
                         f"{self.attached_group_prefix}G0_{obj_index}_L0_{template.name}"
                     )
@@ -965,10 +1039,11 @@ class WarehouseMode(BaseGenerator):
 
                     # Position in world coordinates - EXACT original logic
                     box.location = world_pos
-                    print(
-                        f"    Box {obj_index}: template={template.name}, local({local_cx:.2f},{local_cy:.2f},{pl_top_z:.2f}) -> world({world_pos.x:.2f},{world_pos.y:.2f},{world_pos.z:.2f})"
-                    )
-                    print(f"    Box {obj_index}: final location = {box.location}")
+                    if self.verbose_placement:
+                        print(
+                            f"    Box {obj_index}: template={template.name}, local({local_cx:.2f},{local_cy:.2f},{pl_top_z:.2f}) -> world({world_pos.x:.2f},{world_pos.y:.2f},{world_pos.z:.2f})"
+                        )
+                        print(f"    Box {obj_index}: final location = {box.location}")
 
                     # Scale to fill cell exactly - EXACT original logic
                     try:
@@ -996,33 +1071,32 @@ class WarehouseMode(BaseGenerator):
                     box.scale = Vector((scale_x, scale_y, 1.0))
                     box.rotation_euler = Euler((0, 0, yaw))
 
-                    # Align bottom to pallet top using world coordinates - EXACT original logic
-                    self._align_bottom_to_z(box, pallet_top_z, margin=0.0)
-
-                    # CRITICAL: Parent to pallet while preserving world position - EXACT from original
-                    self._parent_preserve_world(box, pallet)
-
                     # CRITICAL: Ensure visibility
                     box.hide_viewport = False
                     box.hide_render = False
                     box.hide_select = False
 
-                    # Force update
-                    bpy.context.view_layer.update()
-
                     created_objects.append(box)
                     obj_index += 1
 
+            # Align bottoms to pallet top using world coordinates, whole group at once
+            self._align_bottoms_to_z(created_objects, pallet_top_z, margin=0.0)
+
+            # CRITICAL: Parent to pallet while preserving world position - EXACT from original
+            for box in created_objects:
+                self._parent_preserve_world(box, pallet)
+
             bpy.context.view_layer.update()
             print(f"✅ {len(created_objects)} box générées sur {pallet.name}")
 
             # Debug: verify boxes are in scene
-            for box in created_objects:
-                in_scene = box.name in bpy.data.objects
-                visible = not box.hide_viewport and not box.hide_render
-                print(
-                    f"    Debug box {box.name}: in_scene={in_scene}, visible={visible}, location={box.location}"
-                )
+            if self.verbose_placement:
+                for box in created_objects:
+                    in_scene = box.name in bpy.data.objects
+                    visible = not box.hide_viewport and not box.hide_render
+                    print(
+                        f"    Debug box {box.name}: in_scene={in_scene}, visible={visible}, location={box.location}"
+                    )
 
             return created_objects
 
@@ -1090,41 +1164,37 @@ class WarehouseMode(BaseGenerator):
         except Exception as e:
             print(f"❌ Erreur ajout à collection: {e}")
 
-    def _align_bottom_to_z(self, obj, target_z, margin=0.0):
-        """Align object bottom to target Z coordinate - EXACT from original with improved robustness."""
-        try:
-            bpy.context.view_layer.update()
+    def _align_bottoms_to_z(self, objs, target_z, margin=0.0):
+        """Align the bottoms of several objects to target Z with one scene update before and after."""
+        bpy.context.view_layer.update()
 
-            # Get the actual bottom of the object in world space
-            bottom = self._get_object_bottom_z(obj)
+        for obj in objs:
+            try:
+                dz = (target_z + margin) - self._get_object_bottom_z(obj)
 
-            # Calculate the offset needed
-            dz = (target_z + margin) - bottom
+                # Only adjust if there's a significant difference (avoid micro-adjustments)
+                if abs(dz) > 1e-4:
+                    old_z = obj.location.z
+                    obj.location.z += dz
+                    if self.verbose_placement:
+                        print(
+                            f"        Aligned {obj.name}: Z {old_z:.3f} → {obj.location.z:.3f} (offset: {dz:.3f})"
+                        )
 
-            # Only adjust if there's a significant difference (avoid micro-adjustments)
-            if abs(dz) > 1e-4:
-                old_z = obj.location.z
-                obj.location.z += dz
-                print(
-                    f"        Aligned {obj.name}: Z {old_z:.3f} → {obj.location.z:.3f} (offset: {dz:.3f})"
-                )
-                bpy.context.view_layer.update()
+            except Exception as e:
+                print(f"⚠️ Erreur align_bottom_to_z for {obj.name}: {e}")
+                # Fallback: simple positioning
+                obj.location.z = target_z + margin
 
-        except Exception as e:
-            print(f"⚠️ Erreur align_bottom_to_z for {obj.name}: {e}")
-            # Fallback: simple positioning
-            obj.location.z = target_z + margin
+        bpy.context.view_layer.update()
 
     def _get_object_bottom_z(self, obj):
-        """Return the bottom Z coordinate of an object in world space - EXACT from original with better error handling."""
-        try:
-            bpy.context.view_layer.update()
-
-            # Transform all bounding box corners to world space
-            corners = [obj.matrix_world @ Vector(c) for c in obj.bound_box]
-            bottom_z = min(c.z for c in corners)
+        """Return the bottom Z coordinate of an object in world space - EXACT from original with better error handling.
 
-            return bottom_z
+        Expects the view layer to be up to date (the align helpers update it).
+        """
+        try:
+            return self.get_object_bounding_box(obj)["min_z"]
 
         except Exception as e:
             print(f"⚠️ Error getting bottom Z for {obj.name}: {e}")
@@ -1134,6 +1204,33 @@ class WarehouseMode(BaseGenerator):
             except Exception:
                 return obj.location.z
 
+    def get_object_bounding_box(self, obj):
+        """Return the world-space axis-aligned bounds of an object."""
+        world = self._world_corners(obj)
+        lo, hi = world.min(axis=0), world.max(axis=0)
+        return {
+            "min_x": lo[0],
+            "max_x": hi[0],
+            "min_y": lo[1],
+            "max_y": hi[1],
+            "min_z": lo[2],
+            "max_z": hi[2],
+        }
+
+    def _cached_bounding_box(self, obj):
+        """Memoized get_object_bounding_box for objects that stay put within a scene."""
+        bounds = self._bbox_cache.get(obj.name)
+        if bounds is None:
+            bounds = self._bbox_cache[obj.name] = self.get_object_bounding_box(obj)
+        return bounds
+
+    def _cached_bbox_3d(self, obj):
+        """Memoized bbox_3d_oriented; only the camera moves between frames of a scene."""
+        bbox = self._bbox_3d_cache.get(obj.name)
+        if bbox is None:
+            bbox = self._bbox_3d_cache[obj.name] = self.bbox_3d_oriented(obj)
+        return bbox
+
     def _parent_preserve_world(self, child_obj, parent_obj):
         """Parent child to parent while preserving world transform - EXACT from original with better error handling."""
         if not child_obj or not parent_obj:
@@ -1152,9 +1249,10 @@ class WarehouseMode(BaseGenerator):
             # Ensure world transform is preserved
             child_obj.matrix_world = mat_w
 
-            print(
-                f"        Parented {child_obj.name} to {parent_obj.name}, world pos preserved: {child_obj.location}"
-            )
+            if self.verbose_placement:
+                print(
+                    f"        Parented {child_obj.name} to {parent_obj.name}, world pos preserved: {child_obj.location}"
+                )
 
         except Exception as e:
             print(f"⚠️ Error in parent_preserve_world for {child_obj.name}: {e}")
@@ -1175,39 +1273,90 @@ class WarehouseMode(BaseGenerator):
 
     def find_pallet_box_relationships(self, scene_objects):
         """Find relationships between pallets and their boxes."""
-        relationships = []
-        for pallet in scene_objects["pallets"]:
-            boxes = [
-                obj
-                for obj in bpy.data.objects
-                if obj.name.startswith(f"{self.attached_group_prefix}{pallet.name}_")
-            ]
-            relationships.append({"pallet": pallet, "boxes": boxes})
-        return relationships
+        # Bucket attached boxes by pallet name in one pass over the objects;
+        # names look like "<prefix><pallet name>_<suffix>"
+        prefix = self.attached_group_prefix
+        buckets = {pallet.name: [] for pallet in scene_objects["pallets"]}
+        for obj in bpy.data.objects:
+            name = obj.name
+            if not name.startswith(prefix):
+                continue
+            rest = name[len(prefix) :]
+            # Pallet names may contain "_" themselves: try every split point
+            sep = rest.find("_")
+            while sep != -1:
+                bucket = buckets.get(rest[:sep])
+                if bucket is not None:
+                    bucket.append(obj)
+                sep = rest.find("_", sep + 1)
+
+        return [
+            {"pallet": pallet, "boxes": buckets[pallet.name]}
+            for pallet in scene_objects["pallets"]
+        ]
 
     def get_visible_pallets(self, scene_objects, cam_obj, sc):
         """Get pallets that are visible in the current camera view."""
         visible_pallets = []
 
-        for pallet in scene_objects["pallets"]:
+        pallets = scene_objects["pallets"]
+        in_frustum = self._pallets_in_frustum(pallets, cam_obj, sc)
+
+        # Generated boxes only change between scenes; reuse the per-scene scan
+        boxes_by_pallet = {
+            rel["pallet"].name: rel["boxes"]
+            for rel in scene_objects.get("pallet_box_groups", [])
+        }
+
+        for pallet, inside in zip(pallets, in_frustum, strict=False):
+            # Cheap AABB cull before projecting every mesh vertex
+            if not inside:
+                continue
             bbox_2d = self.get_bbox_2d_accurate(pallet, cam_obj, sc)
             if bbox_2d and bbox_2d["area"] > self.config.get("min_pallet_area", 100):
                 pallet_info = {
                     "pallet": pallet,
                     "bbox_2d": bbox_2d,
-                    "bbox_3d": self.bbox_3d_oriented(pallet),
-                    "generated_boxes": [
-                        obj
-                        for obj in bpy.data.objects
-                        if obj.name.startswith(
-                            f"{self.attached_group_prefix}{pallet.name}_"
-                        )
-                    ],
+                    "bbox_3d": self._cached_bbox_3d(pallet),
+                    "generated_boxes": boxes_by_pallet.get(pallet.name, []),
                 }
                 visible_pallets.append(pallet_info)
 
         return visible_pallets
 
+    def _pallets_in_frustum(self, pallets, cam_obj, sc):
+        """Return a bool mask of pallets whose world AABB touches the camera frustum."""
+        if not pallets:
+            return np.zeros(0, dtype=bool)
+
+        # Clip planes (Gribb-Hartmann) from the world -> clip matrix
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        proj = cam_obj.calc_matrix_camera(
+            depsgraph,
+            x=sc.render.resolution_x,
+            y=sc.render.resolution_y,
+            scale_x=sc.render.pixel_aspect_x,
+            scale_y=sc.render.pixel_aspect_y,
+        )
+        view = np.asarray(cam_obj.matrix_world.inverted())
+        m = np.asarray(proj) @ view
+        # left, right, bottom, top, then "in front of the camera" (camera-space
+        # z < 0) rather than the clip_start plane: the 2D bbox test only needs
+        # points in front of the lens and has no near/far limits
+        planes = np.array(
+            [m[3] + m[0], m[3] - m[0], m[3] + m[1], m[3] - m[1], -view[2]]
+        )
+
+        bounds = [self._cached_bounding_box(p) for p in pallets]
+        lo = np.array([[b["min_x"], b["min_y"], b["min_z"]] for b in bounds])
+        hi = np.array([[b["max_x"], b["max_y"], b["max_z"]] for b in bounds])
+
+        # A box is outside if its most positive corner is behind any plane
+        normals = planes[:, None, :3]
+        corners = np.where(normals >= 0, hi[None], lo[None])
+        dist = (normals * corners).sum(axis=2) + planes[:, None, 3]
+        return (dist >= 0).all(axis=0)
+
     def randomize_lighting(self):
         """Set up dynamic warehouse lighting."""
         # Remove existing synthetic lights
@@ -1219,11 +1368,17 @@ class WarehouseMode(BaseGenerator):
             bpy.data.objects.remove(obj, do_unlink=True)
 
         # Create warehouse-appropriate lighting
-        light_count = random.randint(*self.config.get("light_count_range", (2, 4)))
+        rng = self._rng
+        light_count = rng.integers(
+            *self.config.get("light_count_range", (2, 4)), endpoint=True
+        )
         energy_ranges = self.config.get("light_energy_ranges", {})
 
-        for i in range(light_count):
-            light_type = random.choice(["AREA", "SPOT", "POINT"])
+        # Draw every light's type and ceiling position up front
+        light_types = rng.choice(["AREA", "SPOT", "POINT"], size=light_count)
+        locations = rng.uniform((-10, -10, 8), (10, 10, 15), size=(light_count, 3))
+
+        for i, light_type in enumerate(light_types.tolist()):
             light_data = bpy.data.lights.new(
                 f"SynthLightData_{light_type}_{i}", light_type
             )
@@ -1232,21 +1387,15 @@ class WarehouseMode(BaseGenerator):
 
             # Set light properties
             energy_range = energy_ranges.get(light_type, (100, 500))
-            light_data.energy = random.uniform(*energy_range)
+            light_data.energy = rng.uniform(*energy_range)
 
             if light_type == "AREA":
-                light_data.size = random.uniform(2.0, 5.0)
+                light_data.size = rng.uniform(2.0, 5.0)
             elif light_type == "SPOT":
-                light_data.spot_size = math.radians(random.uniform(30, 60))
+                light_data.spot_size = math.radians(rng.uniform(30, 60))
 
             # Position light (warehouse ceiling height)
-            light_obj.location = Vector(
-                (
-                    random.uniform(-10, 10),
-                    random.uniform(-10, 10),
-                    random.uniform(8, 15),
-                )
-            )
+            light_obj.location = Vector(locations[i])
 
             # Point downward
             light_obj.rotation_euler = Euler((math.radians(180), 0, 0))
@@ -1254,12 +1403,8 @@ class WarehouseMode(BaseGenerator):
             # Optional colored lighting
             if self.config.get(
                 "use_colored_lights", True
-            ) and random.random() < self.config.get("colored_light_probability", 0.3):
-                light_data.color = (
-                    random.uniform(0.8, 1.0),
-                    random.uniform(0.8, 1.0),
-                    random.uniform(0.9, 1.0),
-                )
+            ) and rng.random() < self.config.get("colored_light_probability", 0.3):
+                light_data.color = rng.uniform((0.8, 0.8, 0.9), 1.0)
 
     def save_warehouse_frame_outputs(
         self,
@@ -1459,10 +1604,7 @@ class WarehouseMode(BaseGenerator):
                 scenes_warehouse_folder
                 / f"warehouse_scene_{scene_id+1}_{batch_name}_info.json"
             )
-            with open(info_path, "w") as f:
-                import json
-
-                json.dump(scene_info, f, indent=2)
+            self._write_json(info_path, scene_info)
 
         except Exception as e:
             print(f"⚠️  Failed to save generated scene: {e}")
@@ -38,6 +38,20 @@ def mock_blender():
         yield mock_bpy, mock_mathutils
 
 
+@pytest.fixture
+def blender_modules():
+    """Mock every Blender module the generator modes import."""
+    modules = {
+        "bpy": Mock(),
+        "bpy_extras": Mock(),
+        "bpy_extras.object_utils": Mock(),
+        "mathutils": Mock(),
+        "mathutils.kdtree": Mock(),
+    }
+    with patch.dict("sys.modules", modules):
+        yield modules
+
+
 @pytest.fixture
 def sample_scene_file(temp_dir: Path) -> Path:
     """Create a mock Blender scene file for testing."""
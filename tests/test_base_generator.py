@@ -0,0 +1,86 @@
+"""Tests for shared BaseGenerator helpers."""
+
+import importlib
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def base_module(blender_modules):
+    """Import the base generator with the Blender modules mocked out."""
+    return importlib.import_module("palletdatagenerator.modes.base_generator")
+
+
+class TestWriteJson:
+    """_write_json gives the same document with and without orjson."""
+
+    data = {
+        "images": [{"id": np.int64(3), "width": 1280, "score": np.float64(0.5)}],
+        "bbox": np.array([1.0, 2.5, 3.0]),
+        "visible": np.bool_(True),
+        7: "int key",
+    }
+    expected = {
+        "images": [{"id": 3, "width": 1280, "score": 0.5}],
+        "bbox": [1.0, 2.5, 3.0],
+        "visible": True,
+        "7": "int key",
+    }
+
+    def _write(self, base_module, temp_dir, orjson_module):
+        generator = base_module.BaseGenerator({})
+        path = temp_dir / "out.json"
+        with patch.object(base_module, "orjson", orjson_module):
+            generator._write_json(path, self.data)
+        return json.loads(path.read_text())
+
+    def test_stdlib_fallback(self, base_module, temp_dir):
+        assert self._write(base_module, temp_dir, None) == self.expected
+
+    def test_orjson(self, base_module, temp_dir):
+        orjson = pytest.importorskip("orjson")
+
+        assert self._write(base_module, temp_dir, orjson) == self.expected
+
+    def test_fallback_rejects_unknown_types(self, base_module, temp_dir):
+        generator = base_module.BaseGenerator({})
+        with (
+            patch.object(base_module, "orjson", None),
+            pytest.raises(TypeError),
+        ):
+            generator._write_json(temp_dir / "out.json", {"value": object()})
+
+
+class TestDebugFigure:
+    """The cached 3D debug figure is reused across frames and closed at the end."""
+
+    def test_reuse_and_close(self, base_module):
+        plt = pytest.importorskip("matplotlib.pyplot")
+        generator = base_module.BaseGenerator({})
+
+        fig, ax = generator._debug_3d_axes(plt)
+        assert generator._debug_3d_axes(plt) == (fig, ax)
+
+        generator._close_debug_figure()
+        assert generator._debug_fig is None and generator._debug_ax is None
+        assert not plt.fignum_exists(fig.number)
+
+    def test_close_without_figure(self, base_module):
+        generator = base_module.BaseGenerator({})
+
+        generator._close_debug_figure()
+        assert generator._debug_fig is None
+
+    def test_backend_selected_once(self, base_module):
+        pytest.importorskip("matplotlib")
+        with (
+            patch.object(base_module, "_agg_backend_selected", False),
+            patch("matplotlib.use") as use,
+        ):
+            base_module._pyplot()
+            base_module._pyplot()
+
+        use.assert_called_once_with("Agg")
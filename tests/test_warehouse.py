@@ -0,0 +1,294 @@
+"""Tests for the vectorized warehouse-mode helpers against their scalar formulas."""
+
+import importlib
+import math
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def warehouse_module(blender_modules):
+    """Import the warehouse mode with the Blender modules mocked out."""
+    return importlib.import_module("palletdatagenerator.modes.warehouse")
+
+
+@pytest.fixture
+def mode(warehouse_module):
+    """Warehouse mode instance with a seeded generator."""
+    config = {"max_total_images": 20, "seed": 0}
+    generator = warehouse_module.WarehouseMode(config)
+    generator._rng = np.random.default_rng(0)
+    return generator
+
+
+def _pallets(*locations):
+    return [
+        SimpleNamespace(name=f"pallet.{i:03d}", location=loc)
+        for i, loc in enumerate(locations)
+    ]
+
+
+def _euler_xyz_matrix(rx, ry, rz):
+    """Rotation matrix of a Blender XYZ Euler (X applied first)."""
+    cx, sx = math.cos(rx), math.sin(rx)
+    cy, sy = math.cos(ry), math.sin(ry)
+    cz, sz = math.cos(rz), math.sin(rz)
+    rot_x = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    rot_y = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    rot_z = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return rot_z @ rot_y @ rot_x
+
+
+class TestWarehousePath:
+    """generate_warehouse_path against the per-point scalar formula."""
+
+    def test_fallback_path(self, mode):
+        path = mode.generate_warehouse_path({"pallets": []})
+
+        assert path.shape == (2, 6)
+        assert path[:, 2].tolist() == [1.6, 1.6]
+
+    def test_points_follow_scalar_pattern(self, mode):
+        pallets = _pallets((0.0, 0.0, 0.0), (10.0, 4.0, 0.0), (3.0, -6.0, 0.0))
+        path = mode.generate_warehouse_path({"pallets": pallets})
+
+        num_points = 10
+        assert path.shape == (num_points, 6)
+
+        min_x, max_x, min_y, max_y = -5.0, 15.0, -11.0, 9.0
+        for i, (x, y, z) in enumerate(path[:, :3]):
+            base_x = min_x + (max_x - min_x) * (i / (num_points - 1))
+            base_y = min_y + (max_y - min_y) * (0.3 + 0.4 * math.sin(i * 0.5))
+            assert abs(x - base_x) <= 0.5
+            assert abs(y - base_y) <= 0.5
+            assert 1.4 <= z <= 2.0
+
+    def test_camera_looks_at_nearest_pallet(self, mode):
+        pallets = _pallets((0.0, 0.0, 0.0), (10.0, 4.0, 0.0), (3.0, -6.0, 0.0))
+        path = mode.generate_warehouse_path({"pallets": pallets})
+
+        for row in path:
+            position = row[:3]
+            nearest = min(pallets, key=lambda p: math.dist(p.location, position))
+            look = np.subtract(nearest.location, position)
+            look /= np.linalg.norm(look)
+
+            rotation = _euler_xyz_matrix(*row[3:])
+            # Camera looks down its -Z axis with +Y up (to_track_quat("-Z", "Y"))
+            np.testing.assert_allclose(rotation @ (0, 0, -1), look, atol=1e-9)
+            assert (rotation @ (0, 1, 0))[2] >= 0
+
+
+def _scalar_frame(camera_path, progress):
+    """Jitter-free camera pose as the per-frame scalar code computed it."""
+    path_index = progress * (len(camera_path) - 1)
+    index_low = int(path_index)
+    index_high = min(index_low + 1, len(camera_path) - 1)
+    lerp_factor = path_index - index_low
+    low, high = camera_path[index_low], camera_path[index_high]
+    position = [
+        a + (b - a) * lerp_factor for a, b in zip(low[:3], high[:3], strict=True)
+    ]
+    return position + list(low[3:])
+
+
+class TestCameraFrames:
+    """precompute_camera_frames against the per-frame scalar interpolation."""
+
+    path = np.array(
+        [
+            (0.0, 0.0, 1.5, 1.2, 0.0, 0.1),
+            (2.0, 1.0, 1.7, 1.3, 0.0, 0.4),
+            (4.0, 3.0, 1.6, 1.1, 0.0, -0.2),
+        ]
+    )
+
+    @pytest.mark.parametrize("num_frames", [0, 1, 2, 5])
+    def test_matches_scalar_without_jitter(self, mode, num_frames):
+        mode.config.update(
+            camera_lateral_jitter_m=0.0,
+            camera_yaw_jitter_deg=0.0,
+            camera_pitch_deg_range=(0.0, 0.0),
+        )
+        progresses = np.arange(num_frames) / max(1, num_frames - 1)
+        frames = mode.precompute_camera_frames(self.path, progresses)
+
+        assert frames.shape == (num_frames, 6)
+        for frame, progress in zip(frames, progresses, strict=True):
+            np.testing.assert_allclose(frame, _scalar_frame(self.path, progress))
+
+    @pytest.mark.parametrize("num_frames", [1, 2, 5])
+    def test_jitter_stays_in_range(self, mode, num_frames):
+        progresses = np.arange(num_frames) / max(1, num_frames - 1)
+        frames = mode.precompute_camera_frames(self.path, progresses)
+
+        for frame, progress in zip(frames, progresses, strict=True):
+            delta = frame - _scalar_frame(self.path, progress)
+            assert np.all(np.abs(delta[:2]) <= 0.15)
+            assert delta[2] == 0.0 and delta[4] == 0.0
+            assert math.radians(-3.0) <= delta[3] <= math.radians(8.0)
+            assert abs(delta[5]) <= math.radians(3.0)
+
+    def test_final_frame_has_no_jitter(self, mode):
+        frames = mode.precompute_camera_frames(self.path, np.linspace(0.0, 1.0, 4))
+
+        np.testing.assert_array_equal(frames[-1], self.path[-1])
+        assert not np.array_equal(frames[0], self.path[0])
+
+
+class _Matrix:
+    """Stand-in for mathutils.Matrix: array-convertible and invertible."""
+
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=float)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.values if dtype is None else self.values.astype(dtype)
+
+    def inverted(self):
+        return _Matrix(np.linalg.inv(self.values))
+
+
+def _translation(x, y, z):
+    matrix = np.eye(4)
+    matrix[:3, 3] = (x, y, z)
+    return _Matrix(matrix)
+
+
+def _box(name, center, half=0.5):
+    corners = [
+        (sx * half, sy * half, sz * half)
+        for sx in (-1, 1)
+        for sy in (-1, 1)
+        for sz in (-1, 1)
+    ]
+    return SimpleNamespace(
+        name=name, bound_box=corners, matrix_world=_translation(*center)
+    )
+
+
+class TestFrustumCull:
+    """_pallets_in_frustum plane test against boxes known to be in or out of view."""
+
+    # 90 degree square perspective, clip_start 0.1, clip_end 100
+    near, far = 0.1, 100.0
+    projection = _Matrix(
+        [
+            [1.0, 0.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0, 0.0],
+            [0.0, 0.0, (far + near) / (near - far), 2 * far * near / (near - far)],
+            [0.0, 0.0, -1.0, 0.0],
+        ]
+    )
+    scene = SimpleNamespace(
+        render=SimpleNamespace(
+            resolution_x=100, resolution_y=100, pixel_aspect_x=1, pixel_aspect_y=1
+        )
+    )
+
+    def _camera(self, location=(0.0, 0.0, 0.0)):
+        # Identity rotation: looking down -Z
+        return SimpleNamespace(
+            matrix_world=_translation(*location),
+            calc_matrix_camera=lambda *args, **kwargs: self.projection,
+        )
+
+    def test_boxes_in_and_out_of_view(self, mode):
+        pallets = [
+            _box("ahead", (0.0, 0.0, -5.0)),
+            _box("behind", (0.0, 0.0, 5.0)),
+            _box("far_left", (-50.0, 0.0, -5.0)),
+            _box("edge", (5.2, 0.0, -5.0)),
+            _box("above", (0.0, 20.0, -5.0)),
+            _box("before_clip_start", (0.0, 0.0, -0.05), half=0.02),
+        ]
+        mask = mode._pallets_in_frustum(pallets, self._camera(), self.scene)
+
+        assert mask.tolist() == [True, False, False, True, False, True]
+
+    def test_moved_camera(self, mode):
+        pallets = [_box("ahead", (0.0, 0.0, -5.0)), _box("behind", (0.0, 0.0, 5.0))]
+        mask = mode._pallets_in_frustum(pallets, self._camera((0, 0, 10)), self.scene)
+
+        assert mask.tolist() == [True, True]
+
+    def test_no_pallets(self, mode):
+        mask = mode._pallets_in_frustum([], self._camera(), self.scene)
+
+        assert mask.shape == (0,)
+
+
+class TestPalletBoxRelationships:
+    """find_pallet_box_relationships bucketing against the per-pallet prefix scan."""
+
+    def test_matches_prefix_scan(self, warehouse_module, mode):
+        prefix = mode.attached_group_prefix
+        pallets = _pallets((0, 0, 0), (1, 0, 0), (2, 0, 0))
+        pallets[0].name = "pallet"
+        pallets[1].name = "pallet_2"
+        pallets[2].name = "Pallet.001"
+        names = [
+            f"{prefix}pallet_box1",
+            f"{prefix}pallet_2_box1",
+            f"{prefix}pallet_2_box2",
+            f"{prefix}Pallet.001_box",
+            f"{prefix}pallet",
+            f"{prefix}unknown_box",
+            "pallet_box_not_attached",
+            "box1",
+        ]
+        warehouse_module.bpy.data.objects = [SimpleNamespace(name=n) for n in names]
+
+        relationships = mode.find_pallet_box_relationships({"pallets": pallets})
+
+        assert [r["pallet"] for r in relationships] == pallets
+        for relationship in relationships:
+            pallet = relationship["pallet"]
+            expected = [
+                obj
+                for obj in warehouse_module.bpy.data.objects
+                if obj.name.startswith(f"{prefix}{pallet.name}_")
+            ]
+            assert relationship["boxes"] == expected
+
+        by_name = {
+            r["pallet"].name: [b.name for b in r["boxes"]] for r in relationships
+        }
+        # "pallet_2_box1" belongs to both "pallet" and "pallet_2" by prefix
+        assert by_name["pallet"] == names[:3]
+        assert by_name["pallet_2"] == names[1:3]
+        assert by_name["Pallet.001"] == [names[3]]
+
+
+class TestGridCellCenters:
+    """_grid_cell_centers against the nested row/col loop it replaced."""
+
+    @pytest.mark.parametrize("grid", [(1, 1), (2, 1), (1, 2), (2, 2), (3, 2)])
+    def test_matches_nested_loop(self, mode, grid):
+        grid_x, grid_y = grid
+        min_x, min_y, width, depth, top = -0.6, -0.4, 1.2 / grid_x, 0.8 / grid_y, 0.15
+
+        centers = mode._grid_cell_centers(min_x, min_y, width, depth, top, *grid)
+
+        expected = [
+            (min_x + (col + 0.5) * width, min_y + (row + 0.5) * depth, top)
+            for row in range(grid_y)
+            for col in range(grid_x)
+        ]
+        np.testing.assert_allclose(centers, expected)
+
+
+class TestPalletLocations:
+    """_pallet_locations caching per pallet list."""
+
+    def test_cache_follows_the_list(self, mode):
+        first = _pallets((0.0, 0.0, 0.0), (1.0, 2.0, 3.0))
+        second = _pallets((5.0, 5.0, 5.0), (6.0, 6.0, 6.0))
+
+        locations = mode._pallet_locations(first)
+        assert mode._pallet_locations(first) is locations
+        np.testing.assert_array_equal(
+            mode._pallet_locations(second), [p.location for p in second]
+        )